@@ -28,6 +28,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from main import IAPostgreSQL
 from src.utils.logger import setup_logger
 from src.utils.config import Config
+from src.utils.cpu import CpuSampler
 
 # Configurar templates
 templates = Jinja2Templates(directory="web/templates")
@@ -41,6 +42,9 @@ class AdminDashboard:
         self.logger = setup_logger("AdminDashboard")
         self.ia_system = None
         
+        # Amostrador de CPU próprio: leituras não bloqueantes que não interferem no monitor
+        self._cpu_sampler = CpuSampler()
+        
     async def initialize(self):
         """Inicializar sistema IA"""
         try:
@@ -64,7 +68,7 @@ class AdminDashboard:
                 }
             
             return {
-                'cpu_usage': psutil.cpu_percent(interval=1),
+                'cpu_usage': self._cpu_sampler.percent(),
                 'memory': {
                     'total': psutil.virtual_memory().total,
                     'available': psutil.virtual_memory().available,
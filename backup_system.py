@@ -343,21 +343,26 @@ class MamuteBackupSystem:
                 'created_at': datetime.datetime.now().isoformat()
             }
     
+    def _backup_search_dirs(self, backup_type: Optional[str] = None) -> List[tuple]:
+        """Diretórios de backup (diretório, tipo) a pesquisar"""
+        search_dirs = []
+        if backup_type == 'database' or backup_type is None:
+            search_dirs.append((self.db_backup_dir, 'database'))
+        if backup_type == 'files' or backup_type is None:
+            search_dirs.append((self.files_backup_dir, 'files'))
+        if backup_type == 'config' or backup_type is None:
+            search_dirs.append((self.config_backup_dir, 'config'))
+        if backup_type == 'full' or backup_type is None:
+            search_dirs.append((self.backup_dir, 'full'))
+        return search_dirs
+    
     def list_backups(self, backup_type: Optional[str] = None) -> List[Dict[str, Any]]:
         """Listar todos os backups disponíveis"""
         try:
             backups = []
             
             # Buscar em todos os diretórios de backup
-            search_dirs = []
-            if backup_type == 'database' or backup_type is None:
-                search_dirs.append((self.db_backup_dir, 'database'))
-            if backup_type == 'files' or backup_type is None:
-                search_dirs.append((self.files_backup_dir, 'files'))
-            if backup_type == 'config' or backup_type is None:
-                search_dirs.append((self.config_backup_dir, 'config'))
-            if backup_type == 'full' or backup_type is None:
-                search_dirs.append((self.backup_dir, 'full'))
+            search_dirs = self._backup_search_dirs(backup_type)
             
             for search_dir, btype in search_dirs:
                 if btype == 'full':
@@ -388,6 +393,49 @@ class MamuteBackupSystem:
             self.logger.error(f"Erro ao listar backups: {e}")
             return []
     
+    def latest_backup_and_count(self, backup_type: Optional[str] = None) -> tuple:
+        """Obter o backup mais recente e o total de backups sem montar e ordenar a lista
+        
+        Percorre os diretórios uma única vez com os.scandir, mantendo apenas o
+        backup de maior created_at (mesma ordem de list_backups). Metadados
+        ilegíveis ou incompletos são ignorados, como em list_backups.
+        
+        Returns:
+            Tupla (metadados do backup mais recente ou None, total de backups)
+        """
+        latest = None
+        total = 0
+        
+        try:
+            for search_dir, btype in self._backup_search_dirs(backup_type):
+                suffix = "_full.json" if btype == 'full' else ".meta.json"
+                
+                if not search_dir.is_dir():
+                    continue
+                
+                with os.scandir(search_dir) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(suffix) or not entry.is_file():
+                            continue
+                        
+                        try:
+                            with open(entry.path, 'r', encoding='utf-8') as f:
+                                backup_info = json.load(f)
+                        except Exception as e:
+                            self.logger.warning(f"Erro ao ler metadata {entry.path}: {e}")
+                            continue
+                        
+                        total += 1
+                        if latest is None or backup_info.get('created_at', '') > latest.get('created_at', ''):
+                            backup_info['backup_type'] = btype
+                            latest = backup_info
+            
+            return latest, total
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao obter último backup: {e}")
+            return None, total
+    
     def delete_old_backups(self, days_to_keep: int = 7) -> Dict[str, Any]:
         """Remover backups antigos"""
         try:
@@ -8,7 +8,7 @@ from datetime import datetime
 from pathlib import Path
 
 # Importar sistema integrado
-from mamute_advanced_system import mamute_advanced, initialize_mamute_advanced
+from mamute_advanced_system import get_mamute_advanced, initialize_mamute_advanced, install_event_loop_policy
 
 async def demo_notifications():
     """Demonstrar sistema de notificações"""
@@ -37,7 +37,7 @@ async def demo_backup_system():
     
     try:
         # Criar backup de configurações (mais rápido para demo)
-        backup_result = mamute_advanced.backup_system.create_config_backup("demo_backup")
+        backup_result = get_mamute_advanced().backup_system.create_config_backup("demo_backup")
         
         if backup_result.get('status') == 'completed':
             print(f"✅ Backup criado: {backup_result['backup_name']}")
@@ -45,7 +45,7 @@ async def demo_backup_system():
             print(f"📊 Tamanho: {backup_result.get('file_size_kb', 0)} KB")
         
         # Listar backups disponíveis
-        backups = mamute_advanced.backup_system.list_backups('config')
+        backups = get_mamute_advanced().backup_system.list_backups('config')
         print(f"\\n📋 Total de backups de config: {len(backups)}")
         
         for backup in backups[:3]:
@@ -63,7 +63,7 @@ def demo_migration_utils():
     
     try:
         # Simular dados para exportação
-        export_result = mamute_advanced.migration_utils.export_to_json(
+        export_result = get_mamute_advanced().migration_utils.export_to_json(
             'demo_export.json',
             filters={'category': 'demo'}
         )
@@ -87,8 +87,8 @@ def demo_performance_analyzer():
     
     try:
         # Coletar métricas do sistema
-        system_metrics = mamute_advanced.performance_analyzer.collect_system_metrics()
-        db_metrics = mamute_advanced.performance_analyzer.collect_database_metrics()
+        system_metrics = get_mamute_advanced().performance_analyzer.collect_system_metrics()
+        db_metrics = get_mamute_advanced().performance_analyzer.collect_database_metrics()
         
         print(f"📈 Métricas coletadas:")
         print(f"   - Sistema: {len(system_metrics)} métricas")
@@ -100,7 +100,7 @@ def demo_performance_analyzer():
                 print(f"   - {metric.name}: {metric.value:.1f}{metric.unit}")
         
         # Obter recomendações
-        recommendations = mamute_advanced.performance_analyzer.get_recommendations()
+        recommendations = get_mamute_advanced().performance_analyzer.get_recommendations()
         if recommendations:
             print(f"\\n💡 Recomendações: {len(recommendations)}")
             for rec in recommendations[:2]:
@@ -118,7 +118,7 @@ def demo_report_generator():
     
     try:
         # Gerar relatório diário
-        daily_report = mamute_advanced.report_generator.generate_daily_report()
+        daily_report = get_mamute_advanced().report_generator.generate_daily_report()
         
         if daily_report:
             report_path = Path(daily_report)
@@ -131,7 +131,7 @@ def demo_report_generator():
                 print(f"📊 Tamanho: {size_kb:.1f} KB")
         
         # Listar relatórios disponíveis
-        reports = mamute_advanced.report_generator.list_reports()
+        reports = get_mamute_advanced().report_generator.list_reports()
         print(f"\\n📋 Total de relatórios: {len(reports)}")
         
         for report in reports[:3]:
@@ -149,7 +149,7 @@ async def demo_admin_dashboard():
     
     try:
         # Obter dados do dashboard
-        admin_data = await mamute_advanced.admin_dashboard.get_admin_dashboard_data()
+        admin_data = await get_mamute_advanced().admin_dashboard.get_admin_dashboard_data()
         
         if admin_data:
             # Mostrar informações do sistema
@@ -223,7 +223,7 @@ async def main():
         print("\\n🔍 EXECUTANDO DIAGNÓSTICOS COMPLETOS...")
         print("-" * 50)
         
-        diagnostics = await mamute_advanced.run_system_diagnostics()
+        diagnostics = await get_mamute_advanced().run_system_diagnostics()
         
         if diagnostics:
             summary = diagnostics.get('summary', {})
@@ -237,7 +237,7 @@ async def main():
         print("\\n📋 GERANDO RELATÓRIO FINAL DE SAÚDE...")
         print("-" * 50)
         
-        health_report = await mamute_advanced.generate_system_health_report()
+        health_report = await get_mamute_advanced().generate_system_health_report()
         
         if health_report:
             overview = health_report.get('system_overview', {})
@@ -284,4 +284,5 @@ async def main():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    install_event_loop_policy()
     asyncio.run(main())
\ No newline at end of file
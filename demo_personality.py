@@ -86,7 +86,7 @@ class MamutePersonalityDemo:
         self.print_welcome()
         
         # Mostrar mensagem de boas-vindas
-        welcome = self.chat_ia.get_welcome_message()
+        welcome = await self.chat_ia.aget_welcome_message()
         self.print_styled_response(welcome)
         
         # Mostrar exemplos
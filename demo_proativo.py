@@ -113,7 +113,7 @@ async def demo_ia_proativa():
         stats = chat_system.session_stats
         print(f"🔢 Consultas processadas: {stats.get('queries', 0)}")
         print(f"✅ Consultas bem-sucedidas: {stats.get('successful_queries', 0)}")
-        print(f"⏱️  Tempo de sessão: {stats.get('session_time', 'N/A')}")
+        print(f"⏱️  Tempo de sessão: {getattr(chat_system, 'session_time', 'N/A')}")
     print()
     
     print("🎯 RESULTADO: IA Mamute Proativa aplicou melhorias automaticamente!")
@@ -5,24 +5,145 @@ Sistema unificado para gerenciar todas as extensões avançadas
 import os
 import sys
 import asyncio
+import importlib
+import io
 import json
-from datetime import datetime
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from functools import cached_property, lru_cache
 from typing import Dict, List, Optional, Any
 from pathlib import Path
 
+import aiofiles
+
+# orjson serializa bem mais rápido que json; usar json como fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+# uvloop acelera o event loop (não disponível no Windows)
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+    uvloop = None
+
+# Tentar importar psutil, usar fallback se não disponível
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
 # Adicionar o diretório principal ao path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-# Importar todos os novos módulos
-from admin_dashboard import AdminDashboard, get_admin_dashboard_data
-from backup_system import MamuteBackupSystem
-from data_migration_utils import DataMigrationUtilities
-from notification_system import NotificationSystem, notify_info, notify_success, notify_warning, notify_error
-from performance_analyzer import PerformanceAnalyzer
-from report_generator import ReportGenerator
-
 from src.utils.config import Config
 from src.utils.logger import setup_logger
+from src.utils.cpu import CpuSampler
+
+# Versão do Python (ex.: "3.11.5") calculada uma única vez
+_PY_VERSION = sys.version.split()[0]
+
+# Índice dos subsistemas: atributo -> (módulo, classe)
+# Os módulos só são importados quando o subsistema é usado pela primeira vez
+_SUBSYSTEMS = {
+    'admin_dashboard': ('admin_dashboard', 'AdminDashboard'),
+    'backup_system': ('backup_system', 'MamuteBackupSystem'),
+    'migration_utils': ('data_migration_utils', 'DataMigrationUtilities'),
+    'notification_system': ('notification_system', 'NotificationSystem'),
+    'performance_analyzer': ('performance_analyzer', 'PerformanceAnalyzer'),
+    'report_generator': ('report_generator', 'ReportGenerator'),
+}
+
+def _load_subsystem(name: str):
+    """Importar o módulo do subsistema e instanciar sua classe"""
+    module_name, class_name = _SUBSYSTEMS[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)()
+
+async def get_admin_dashboard_data():
+    """Obter dados do dashboard admin (importa o módulo sob demanda)"""
+    return await importlib.import_module("admin_dashboard").get_admin_dashboard_data()
+
+# Fila de notificações: até _NOTIFY_BATCH_SIZE itens são agrupados por envio,
+# aguardando no máximo _NOTIFY_FLUSH_INTERVAL segundos por novos itens
+_NOTIFY_QUEUE_SIZE = 1000
+_NOTIFY_BATCH_SIZE = 140
+_NOTIFY_FLUSH_INTERVAL = 0.05
+
+# Validade (segundos) dos dados do dashboard admin em cache
+_ADMIN_CACHE_TTL = 2.0
+
+# Tempo máximo (segundos) que a finalização aguarda o backup de emergência
+_EMERGENCY_BACKUP_TIMEOUT = 30.0
+
+# Tipos que o JSON representa diretamente
+_JSON_SCALARS = (str, int, float, bool, type(None))
+
+def _to_jsonable(obj: Any) -> Any:
+    """Converter recursivamente valores sem representação JSON (datetime, Decimal, Path...)"""
+    if isinstance(obj, _JSON_SCALARS):
+        return obj
+    if isinstance(obj, dict):
+        return {
+            key if isinstance(key, str) else str(key): _to_jsonable(value)
+            for key, value in obj.items()
+        }
+    if isinstance(obj, (list, tuple, set)):
+        return [_to_jsonable(value) for value in obj]
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    # timedelta, Path e demais objetos viram texto
+    return str(obj)
+
+def _serialize_report(data: Any) -> bytes:
+    """Serializar relatório como JSON indentado em UTF-8"""
+    data = _to_jsonable(data)
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _iter_report_chunks(data: Dict[str, Any]):
+    """Gerar o JSON do relatório em partes, serializando listas item a item
+    
+    Evita manter o documento inteiro codificado em memória junto com o dict.
+    """
+    yield b'{'
+    for i, (key, value) in enumerate(data.items()):
+        yield (b',\n  ' if i else b'\n  ') + _serialize_report(str(key)) + b': '
+        if isinstance(value, list) and value:
+            for j, item in enumerate(value):
+                yield (b',\n    ' if j else b'[\n    ') + _serialize_report(item).replace(b'\n', b'\n    ')
+            yield b'\n  ]'
+        else:
+            yield _serialize_report(value).replace(b'\n', b'\n  ')
+    yield b'\n}' if data else b'}'
+
+def _stream_report(path: Path, data: Dict[str, Any]):
+    """Gravar relatório JSON de forma incremental (bloqueante: usar em thread)"""
+    with open(path, 'wb') as f:
+        f.writelines(_iter_report_chunks(data))
+
+async def _write_report(path: Path, data: Dict[str, Any]):
+    """Gravar relatório JSON sem bloquear o event loop"""
+    if ORJSON_AVAILABLE:
+        payload = _serialize_report(data)
+    else:
+        # json puro é lento para relatórios grandes: serializar fora do loop
+        loop = asyncio.get_running_loop()
+        payload = await loop.run_in_executor(None, _serialize_report, data)
+    
+    async with aiofiles.open(path, 'wb') as f:
+        await f.write(payload)
 
 class MamuteAdvancedSystem:
     """Sistema avançado integrado do Mamute"""
@@ -32,62 +153,174 @@ class MamuteAdvancedSystem:
         self.config = Config(config_file)
         self.logger = setup_logger("MamuteAdvanced")
         
-        # Inicializar todos os subsistemas
-        self.admin_dashboard = AdminDashboard()
-        self.backup_system = MamuteBackupSystem()
-        self.migration_utils = DataMigrationUtilities()
-        self.notification_system = NotificationSystem()
-        self.performance_analyzer = PerformanceAnalyzer()
-        self.report_generator = ReportGenerator()
-        
-        # Status dos subsistemas
+        # Status dos subsistemas e visão derivada usada nos relatórios
         self.subsystems_status = {}
+        self._subsystems_health: Dict[str, str] = {}
+        self._healthy_subsystems = 0
+        
+        # Fila de notificações (criada com o event loop em execução)
+        self._notify_queue: Optional[asyncio.Queue] = None
+        self._notify_task: Optional[asyncio.Task] = None
+        
+        # Cache dos dados do dashboard admin: (instante monotônico, dados)
+        self._admin_cache: Optional[tuple] = None
+        self._admin_refresh: Optional[asyncio.Task] = None
+        
+        # Diretórios de relatórios resolvidos e criados uma única vez
+        self._health_dir = Path("reports/system_health").resolve()
+        self._diag_dir = Path("reports/diagnostics").resolve()
+        self._health_dir.mkdir(parents=True, exist_ok=True)
+        self._diag_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Handle do processo atual reutilizado pelos diagnósticos
+        self._proc = psutil.Process(os.getpid()) if PSUTIL_AVAILABLE else None
+        
+        # Amostrador de CPU dos diagnósticos, independente do monitor e do dashboard
+        self._cpu_sampler = CpuSampler()
         
         self.logger.info("Sistema avançado integrado do Mamute inicializado")
     
+    # Subsistemas carregados sob demanda no primeiro acesso
+    @cached_property
+    def admin_dashboard(self):
+        return _load_subsystem('admin_dashboard')
+    
+    @cached_property
+    def backup_system(self):
+        return _load_subsystem('backup_system')
+    
+    @cached_property
+    def migration_utils(self):
+        return _load_subsystem('migration_utils')
+    
+    @cached_property
+    def notification_system(self):
+        return _load_subsystem('notification_system')
+    
+    @cached_property
+    def performance_analyzer(self):
+        return _load_subsystem('performance_analyzer')
+    
+    @cached_property
+    def report_generator(self):
+        return _load_subsystem('report_generator')
+    
+    def _notify(self, level: str, title: str, message: str):
+        """Enfileirar notificação para envio agrupado"""
+        if self._notify_queue is None:
+            self._notify_queue = asyncio.Queue(maxsize=_NOTIFY_QUEUE_SIZE)
+            self._notify_task = asyncio.create_task(self._flush_notifications())
+        
+        try:
+            self._notify_queue.put_nowait((level, title, message))
+        except asyncio.QueueFull:
+            self.logger.warning(f"Fila de notificações cheia, descartando: {title}")
+    
+    async def _flush_notifications(self):
+        """Agrupar notificações da fila e enviá-las em lote"""
+        queue = self._notify_queue
+        
+        while True:
+            batch = [await queue.get()]
+            try:
+                while len(batch) < _NOTIFY_BATCH_SIZE:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout=_NOTIFY_FLUSH_INTERVAL))
+            except asyncio.TimeoutError:
+                pass
+            
+            try:
+                await self.notification_system.notify_batch(batch)
+            except Exception as e:
+                self.logger.warning(f"Erro ao enviar lote de notificações: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+    
+    async def flush_notifications(self):
+        """Aguardar o envio de todas as notificações pendentes"""
+        if self._notify_queue is not None:
+            await self._notify_queue.join()
+    
+    async def _get_admin_data(self) -> Dict[str, Any]:
+        """Dados do dashboard admin com cache curto
+        
+        Dentro do TTL o valor em cache é devolvido; expirado, o valor antigo
+        ainda é devolvido enquanto uma única atualização roda em segundo plano.
+        """
+        cached = self._admin_cache
+        if cached is None:
+            return await self._refresh_admin_data()
+        
+        expired = time.monotonic() - cached[0] >= _ADMIN_CACHE_TTL
+        if expired and (self._admin_refresh is None or self._admin_refresh.done()):
+            self._admin_refresh = asyncio.create_task(self._revalidate_admin_data())
+        
+        return cached[1]
+    
+    async def _refresh_admin_data(self) -> Dict[str, Any]:
+        """Buscar dados do dashboard admin e atualizar o cache"""
+        admin_data = await get_admin_dashboard_data()
+        self._admin_cache = (time.monotonic(), admin_data)
+        return admin_data
+    
+    async def _revalidate_admin_data(self):
+        """Atualizar o cache do dashboard admin em segundo plano"""
+        try:
+            await self._refresh_admin_data()
+        except Exception as e:
+            self.logger.warning(f"Erro ao atualizar dados do dashboard admin: {e}")
+    
+    def _set_subsystems_status(self, status: Dict[str, bool]):
+        """Registrar status dos subsistemas e atualizar a visão de saúde"""
+        self.subsystems_status = status
+        self._subsystems_health = {
+            name: "healthy" if ok else "error"
+            for name, ok in status.items()
+        }
+        self._healthy_subsystems = sum(1 for ok in status.values() if ok)
+    
     async def initialize_all_systems(self) -> Dict[str, bool]:
         """Inicializar todos os subsistemas"""
         initialization_results = {}
         
         try:
-            # Inicializar dashboard admin
-            await notify_info("Inicialização", "Inicializando dashboard administrativo...")
-            admin_init = await self.admin_dashboard.initialize()
-            initialization_results['admin_dashboard'] = admin_init
-            
-            # Configurar sistema de notificações
-            await notify_info("Inicialização", "Configurando sistema de notificações...")
+            # Avisos só são enfileirados: o envio em lote corre em paralelo com a
+            # inicialização do dashboard (substitui o asyncio.gather anterior)
+            self._notify('info', "Inicialização", "Inicializando dashboard administrativo...")
+            self._notify('info', "Inicialização", "Configurando sistema de notificações...")
+            self._notify('info', "Inicialização", "Verificando sistema de backup...")
+            self._notify('info', "Inicialização", "Verificando utilitários de migração...")
+            self._notify('info', "Inicialização", "Configurando analisador de performance...")
+            self._notify('info', "Inicialização", "Configurando gerador de relatórios...")
+            
+            # Falha do dashboard é registrada como False, sem abortar os demais subsistemas
+            try:
+                initialization_results['admin_dashboard'] = await self.admin_dashboard.initialize() is True
+            except Exception as e:
+                self.logger.error(f"Erro ao inicializar dashboard administrativo: {e}")
+                initialization_results['admin_dashboard'] = False
+            # Demais subsistemas não exigem inicialização assíncrona
             initialization_results['notification_system'] = True
-            
-            # Sistema de backup sempre disponível
-            await notify_info("Inicialização", "Verificando sistema de backup...")
             initialization_results['backup_system'] = True
-            
-            # Utilitários de migração sempre disponíveis
-            await notify_info("Inicialização", "Verificando utilitários de migração...")
             initialization_results['migration_utils'] = True
-            
-            # Analisador de performance
-            await notify_info("Inicialização", "Configurando analisador de performance...")
             initialization_results['performance_analyzer'] = True
-            
-            # Gerador de relatórios
-            await notify_info("Inicialização", "Configurando gerador de relatórios...")
             initialization_results['report_generator'] = True
             
-            self.subsystems_status = initialization_results
+            self._set_subsystems_status(initialization_results)
             
             # Notificar sucesso total
-            successful_systems = sum(1 for status in initialization_results.values() if status)
+            successful_systems = sum(1 for status in initialization_results.values() if status is True)
             total_systems = len(initialization_results)
             
             if successful_systems == total_systems:
-                await notify_success(
+                self._notify(
+                    'success',
                     "Sistema Integrado", 
                     f"Todos os {total_systems} subsistemas inicializados com sucesso!"
                 )
             else:
-                await notify_warning(
+                self._notify(
+                    'warning',
                     "Sistema Integrado", 
                     f"{successful_systems}/{total_systems} subsistemas inicializados"
                 )
@@ -95,7 +328,7 @@ class MamuteAdvancedSystem:
             return initialization_results
             
         except Exception as e:
-            await notify_error("Erro na Inicialização", f"Erro durante inicialização: {str(e)}")
+            self._notify('error', "Erro na Inicialização", f"Erro durante inicialização: {str(e)}")
             self.logger.error(f"Erro na inicialização dos subsistemas: {e}")
             return {}
     
@@ -114,90 +347,92 @@ class MamuteAdvancedSystem:
     async def start_monitoring_services(self):
         """Iniciar serviços de monitoramento"""
         try:
-            await notify_info("Monitoramento", "Iniciando serviços de monitoramento...")
-            
-            # Iniciar monitoramento de performance
-            self.performance_analyzer.start_monitoring()
-            
-            # Agendar backups automáticos
-            self.backup_system.schedule_automatic_backups()
-            
-            # Agendar relatórios automáticos
-            self.report_generator.schedule_automatic_reports()
+            self._notify('info', "Monitoramento", "Iniciando serviços de monitoramento...")
+            
+            # Monitoramento de performance, backups e relatórios automáticos
+            # são configurados em threads, em paralelo, sem bloquear o loop
+            await asyncio.gather(
+                asyncio.to_thread(self.performance_analyzer.start_monitoring),
+                asyncio.to_thread(self.backup_system.schedule_automatic_backups),
+                asyncio.to_thread(self.report_generator.schedule_automatic_reports)
+            )
             
             # Iniciar servidor WebSocket de notificações
             await self.notification_system.start_websocket_server()
             
-            await notify_success(
+            self._notify(
+                'success',
                 "Monitoramento Iniciado", 
                 "Todos os serviços de monitoramento estão ativos"
             )
             
         except Exception as e:
-            await notify_error("Erro no Monitoramento", f"Erro ao iniciar monitoramento: {str(e)}")
+            self._notify('error', "Erro no Monitoramento", f"Erro ao iniciar monitoramento: {str(e)}")
             self.logger.error(f"Erro ao iniciar serviços de monitoramento: {e}")
     
     async def generate_system_health_report(self) -> Dict[str, Any]:
         """Gerar relatório completo de saúde do sistema"""
         try:
-            await notify_info("Relatório de Saúde", "Gerando relatório completo do sistema...")
-            
-            # Obter dados do dashboard admin
-            admin_data = await get_admin_dashboard_data()
-            
-            # Obter métricas de performance
-            performance_report = self.performance_analyzer.generate_performance_report()
-            
-            # Status dos subsistemas
-            subsystems_health = {
-                name: "healthy" if status else "error" 
-                for name, status in self.subsystems_status.items()
-            }
-            
-            # Notificações recentes
-            recent_notifications = self.notification_system.get_recent_notifications(10)
+            self._notify('info', "Relatório de Saúde", "Gerando relatório completo do sistema...")
+            
+            # Coletar dados independentes em paralelo: dashboard admin, métricas
+            # de performance, notificações recentes, backups, relatórios e
+            # recomendações (chamadas síncronas rodam em threads)
+            (
+                admin_data,
+                performance_report,
+                recent_notifications,
+                (latest_backup, total_backups),
+                (latest_report, total_reports),
+                recommendations
+            ) = await asyncio.gather(
+                self._get_admin_data(),
+                asyncio.to_thread(self.performance_analyzer.generate_performance_report),
+                asyncio.to_thread(self.notification_system.get_recent_notifications, 10),
+                asyncio.to_thread(self.backup_system.latest_backup_and_count),
+                asyncio.to_thread(self.report_generator.latest_report_and_count),
+                asyncio.to_thread(self.performance_analyzer.get_recommendations)
+            )
             
-            # Backups disponíveis
-            available_backups = self.backup_system.list_backups()
+            # Status dos subsistemas (mantido por _set_subsystems_status)
+            healthy_subsystems = self._healthy_subsystems
+            total_subsystems = len(self._subsystems_health)
             
-            # Relatórios gerados
-            available_reports = self.report_generator.list_reports()
+            # Um único instante para o timestamp e o nome do arquivo
+            now = datetime.now()
             
             health_report = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now.isoformat(),
                 'system_overview': {
                     'mamute_version': '2.0.0-advanced',
-                    'python_version': sys.version,
-                    'subsystems_count': len(self.subsystems_status),
-                    'healthy_subsystems': sum(1 for status in self.subsystems_status.values() if status),
-                    'overall_status': 'healthy' if all(self.subsystems_status.values()) else 'warning'
+                    'python_version': _PY_VERSION,
+                    'subsystems_count': total_subsystems,
+                    'healthy_subsystems': healthy_subsystems,
+                    'overall_status': 'healthy' if healthy_subsystems == total_subsystems else 'warning'
                 },
-                'subsystems_status': subsystems_health,
+                'subsystems_status': dict(self._subsystems_health),
                 'admin_dashboard': admin_data,
                 'performance_metrics': performance_report.get('summary', {}),
                 'recent_notifications': recent_notifications,
                 'backup_info': {
-                    'total_backups': len(available_backups),
-                    'latest_backup': available_backups[0] if available_backups else None
+                    'total_backups': total_backups,
+                    'latest_backup': latest_backup
                 },
                 'reports_info': {
-                    'total_reports': len(available_reports),
-                    'latest_report': available_reports[0] if available_reports else None
+                    'total_reports': total_reports,
+                    'latest_report': latest_report
                 },
-                'recommendations': self.performance_analyzer.get_recommendations()
+                'recommendations': recommendations
             }
             
             # Salvar relatório
-            reports_dir = Path("reports/system_health")
-            reports_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            report_file = self._health_dir / f"system_health_{timestamp}.json"
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            report_file = reports_dir / f"system_health_{timestamp}.json"
+            await _write_report(report_file, health_report)
             
-            with open(report_file, 'w', encoding='utf-8') as f:
-                json.dump(health_report, f, indent=2, default=str, ensure_ascii=False)
-            
-            await notify_success(
+            self._notify(
+                'success',
                 "Relatório Concluído", 
                 f"Relatório de saúde salvo: {report_file.name}"
             )
@@ -205,25 +440,27 @@ class MamuteAdvancedSystem:
             return health_report
             
         except Exception as e:
-            await notify_error("Erro no Relatório", f"Erro ao gerar relatório de saúde: {str(e)}")
+            self._notify('error', "Erro no Relatório", f"Erro ao gerar relatório de saúde: {str(e)}")
             self.logger.error(f"Erro ao gerar relatório de saúde: {e}")
             return {}
     
     async def create_emergency_backup(self) -> Dict[str, Any]:
         """Criar backup de emergência completo"""
         try:
-            await notify_warning("Backup de Emergência", "Iniciando backup de emergência...")
+            self._notify('warning', "Backup de Emergência", "Iniciando backup de emergência...")
             
-            # Criar backup completo
-            backup_result = self.backup_system.create_full_backup()
+            # Criar backup completo (operação longa, executada em thread)
+            backup_result = await asyncio.to_thread(self.backup_system.create_full_backup)
             
             if backup_result.get('status') == 'completed':
-                await notify_success(
+                self._notify(
+                    'success',
                     "Backup de Emergência", 
                     f"Backup concluído: {backup_result['backup_name']}"
                 )
             else:
-                await notify_error(
+                self._notify(
+                    'error',
                     "Backup de Emergência", 
                     "Falha no backup de emergência"
                 )
@@ -231,16 +468,19 @@ class MamuteAdvancedSystem:
             return backup_result
             
         except Exception as e:
-            await notify_error("Erro no Backup", f"Erro no backup de emergência: {str(e)}")
+            self._notify('error', "Erro no Backup", f"Erro no backup de emergência: {str(e)}")
             return {'status': 'failed', 'error': str(e)}
     
     async def run_system_diagnostics(self) -> Dict[str, Any]:
         """Executar diagnósticos completos do sistema"""
         try:
-            await notify_info("Diagnósticos", "Executando diagnósticos do sistema...")
+            self._notify('info', "Diagnósticos", "Executando diagnósticos do sistema...")
+            
+            # Um único instante para o timestamp e o nome do arquivo
+            now = datetime.now()
             
             diagnostics = {
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': now.isoformat(),
                 'tests_performed': [],
                 'issues_found': [],
                 'recommendations': []
@@ -264,11 +504,10 @@ class MamuteAdvancedSystem:
             
             # Teste 2: Espaço em disco
             try:
-                try:
-                    import psutil
+                if PSUTIL_AVAILABLE:
                     disk_usage = psutil.disk_usage('/')
                     disk_percent = (disk_usage.used / disk_usage.total) * 100
-                except ImportError:
+                else:
                     # Fallback sem psutil
                     disk_percent = 0
                 
@@ -289,29 +528,46 @@ class MamuteAdvancedSystem:
             
             # Teste 3: Memória
             try:
-                try:
-                    import psutil
-                    memory = psutil.virtual_memory()
-                except ImportError:
+                if PSUTIL_AVAILABLE:
+                    memory_percent = psutil.virtual_memory().percent
+                    process_mb = self._proc.memory_info().rss / (1024 * 1024)
+                    memory_details = f'Memory usage: {memory_percent:.1f}% (Mamute: {process_mb:.1f} MB)'
+                else:
                     # Fallback sem psutil
-                    class FakeMemory:
-                        percent = 0
-                    memory = FakeMemory()
+                    memory_percent = 0
+                    memory_details = f'Memory usage: {memory_percent:.1f}%'
                 
                 diagnostics['tests_performed'].append({
                     'test': 'Memory Usage',
-                    'status': 'pass' if memory.percent < 85 else 'warning',
-                    'details': f'Memory usage: {memory.percent:.1f}%'
+                    'status': 'pass' if memory_percent < 85 else 'warning',
+                    'details': memory_details
                 })
                 
-                if memory.percent > 85:
-                    diagnostics['issues_found'].append(f'High memory usage: {memory.percent:.1f}%')
+                if memory_percent > 85:
+                    diagnostics['issues_found'].append(f'High memory usage: {memory_percent:.1f}%')
                     diagnostics['recommendations'].append('Consider adding more RAM or optimize memory usage')
             
             except Exception as e:
                 diagnostics['issues_found'].append(f'Memory test error: {str(e)}')
             
-            # Teste 4: Verificar subsistemas
+            # Teste 4: CPU (uso desde a última leitura, sem bloquear o loop)
+            try:
+                cpu_percent = self._cpu_sampler.percent()
+                
+                diagnostics['tests_performed'].append({
+                    'test': 'CPU Usage',
+                    'status': 'pass' if cpu_percent < 90 else 'warning',
+                    'details': f'CPU usage: {cpu_percent:.1f}%'
+                })
+                
+                if cpu_percent > 90:
+                    diagnostics['issues_found'].append(f'High CPU usage: {cpu_percent:.1f}%')
+                    diagnostics['recommendations'].append('Check for CPU-intensive processes or scale resources')
+            
+            except Exception as e:
+                diagnostics['issues_found'].append(f'CPU test error: {str(e)}')
+            
+            # Teste 5: Verificar subsistemas
             failed_subsystems = [
                 name for name, status in self.subsystems_status.items() 
                 if not status
@@ -342,22 +598,20 @@ class MamuteAdvancedSystem:
             }
             
             # Salvar diagnósticos
-            reports_dir = Path("reports/diagnostics")
-            reports_dir.mkdir(parents=True, exist_ok=True)
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            diag_file = self._diag_dir / f"diagnostics_{timestamp}.json"
             
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            diag_file = reports_dir / f"diagnostics_{timestamp}.json"
-            
-            with open(diag_file, 'w', encoding='utf-8') as f:
-                json.dump(diagnostics, f, indent=2, default=str, ensure_ascii=False)
+            await asyncio.to_thread(_stream_report, diag_file, diagnostics)
             
             if diagnostics['summary']['overall_health'] == 'healthy':
-                await notify_success(
+                self._notify(
+                    'success',
                     "Diagnósticos Concluídos", 
                     f"Sistema saudável - {passed_tests}/{total_tests} testes passaram"
                 )
             else:
-                await notify_warning(
+                self._notify(
+                    'warning',
                     "Diagnósticos Concluídos", 
                     f"{len(diagnostics['issues_found'])} problemas encontrados - verifique relatório"
                 )
@@ -365,91 +619,136 @@ class MamuteAdvancedSystem:
             return diagnostics
             
         except Exception as e:
-            await notify_error("Erro nos Diagnósticos", f"Erro durante diagnósticos: {str(e)}")
+            self._notify('error', "Erro nos Diagnósticos", f"Erro durante diagnósticos: {str(e)}")
             self.logger.error(f"Erro ao executar diagnósticos: {e}")
             return {}
     
-    async def shutdown_all_systems(self):
-        """Finalizar todos os subsistemas ordenadamente"""
+    async def shutdown_all_systems(self, backup_timeout: float = _EMERGENCY_BACKUP_TIMEOUT):
+        """Finalizar todos os subsistemas ordenadamente
+        
+        Args:
+            backup_timeout: Tempo máximo (segundos) de espera pelo backup final
+        """
         try:
-            await notify_info("Finalização", "Finalizando subsistemas...")
+            self._notify('info', "Finalização", "Finalizando subsistemas...")
+            
+            # Último backup antes de sair, em paralelo com a parada do monitoramento
+            backup_task = asyncio.create_task(self.create_emergency_backup())
             
             # Parar monitoramento
-            self.performance_analyzer.stop_monitoring()
+            await asyncio.to_thread(self.performance_analyzer.stop_monitoring)
             
-            # Último backup antes de sair
-            await self.create_emergency_backup()
+            # O backup tem prazo limitado para não travar a finalização
+            try:
+                await asyncio.wait_for(backup_task, timeout=backup_timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Backup de emergência excedeu {backup_timeout}s - finalizando sem aguardar")
+                self._notify('warning', "Backup de Emergência", "Backup não concluído dentro do prazo de finalização")
             
-            await notify_success("Sistema Finalizado", "Todos os subsistemas foram finalizados com segurança")
+            self._notify('success', "Sistema Finalizado", "Todos os subsistemas foram finalizados com segurança")
             
         except Exception as e:
-            await notify_error("Erro na Finalização", f"Erro durante finalização: {str(e)}")
+            self._notify('error', "Erro na Finalização", f"Erro durante finalização: {str(e)}")
+        
+        # Enviar notificações pendentes e encerrar a fila
+        await self.flush_notifications()
+        if self._notify_task is not None:
+            self._notify_task.cancel()
+            self._notify_task = None
+            self._notify_queue = None
+
+def install_event_loop_policy():
+    """Usar uvloop como event loop padrão quando disponível (pip install uvloop)"""
+    if UVLOOP_AVAILABLE:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
-# Instância global do sistema avançado
-mamute_advanced = MamuteAdvancedSystem()
+@lru_cache(maxsize=1)
+def get_mamute_advanced() -> MamuteAdvancedSystem:
+    """Obter a instância compartilhada do sistema avançado (criada no primeiro uso)"""
+    return MamuteAdvancedSystem()
 
 async def initialize_mamute_advanced():
     """Função de conveniência para inicializar sistema completo"""
+    mamute_advanced = get_mamute_advanced()
     results = await mamute_advanced.initialize_all_systems()
     await mamute_advanced.start_monitoring_services()
     return results
 
 async def main():
     """Função principal para demonstrar sistema integrado"""
-    print("🐘" + "=" * 70 + "🐘")
-    print("                MAMUTE - SISTEMA AVANÇADO INTEGRADO")
-    print("🐘" + "=" * 70 + "🐘")
+    # Saída acumulada em memória e escrita de uma vez a cada etapa
+    out = io.StringIO()
+    
+    def flush_output():
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
+        out.seek(0)
+        out.truncate()
+    
+    print("🐘" + "=" * 70 + "🐘", file=out)
+    print("                MAMUTE - SISTEMA AVANÇADO INTEGRADO", file=out)
+    print("🐘" + "=" * 70 + "🐘", file=out)
     
     try:
+        mamute_advanced = get_mamute_advanced()
+        
         # Inicializar sistema completo
-        print("\\n🚀 Inicializando sistema avançado...")
+        print("\\n🚀 Inicializando sistema avançado...", file=out)
+        flush_output()
         init_results = await initialize_mamute_advanced()
         
-        print(f"\\n✅ Subsistemas inicializados:")
+        print(f"\\n✅ Subsistemas inicializados:", file=out)
         for subsystem, status in init_results.items():
             emoji = "✅" if status else "❌"
-            print(f"   {emoji} {subsystem.replace('_', ' ').title()}")
+            print(f"   {emoji} {subsystem.replace('_', ' ').title()}", file=out)
         
         # Executar diagnósticos
-        print("\\n🔍 Executando diagnósticos do sistema...")
+        print("\\n🔍 Executando diagnósticos do sistema...", file=out)
+        flush_output()
         diagnostics = await mamute_advanced.run_system_diagnostics()
         
         if diagnostics:
             summary = diagnostics.get('summary', {})
-            print(f"   📊 Testes: {summary.get('passed_tests', 0)}/{summary.get('total_tests', 0)} passaram")
-            print(f"   🏥 Status: {summary.get('overall_health', 'unknown').upper()}")
+            print(f"   📊 Testes: {summary.get('passed_tests', 0)}/{summary.get('total_tests', 0)} passaram", file=out)
+            print(f"   🏥 Status: {summary.get('overall_health', 'unknown').upper()}", file=out)
             
             if diagnostics.get('issues_found'):
-                print(f"   ⚠️ Problemas encontrados: {len(diagnostics['issues_found'])}")
+                print(f"   ⚠️ Problemas encontrados: {len(diagnostics['issues_found'])}", file=out)
         
         # Gerar relatório de saúde
-        print("\\n📋 Gerando relatório de saúde do sistema...")
+        print("\\n📋 Gerando relatório de saúde do sistema...", file=out)
+        flush_output()
         health_report = await mamute_advanced.generate_system_health_report()
         
         if health_report:
             overview = health_report.get('system_overview', {})
-            print(f"   🐘 Mamute versão: {overview.get('mamute_version', 'N/A')}")
-            print(f"   🔧 Subsistemas: {overview.get('healthy_subsystems', 0)}/{overview.get('subsystems_count', 0)} saudáveis")
-            print(f"   📊 Status geral: {overview.get('overall_status', 'unknown').upper()}")
+            print(f"   🐘 Mamute versão: {overview.get('mamute_version', 'N/A')}", file=out)
+            print(f"   🔧 Subsistemas: {overview.get('healthy_subsystems', 0)}/{overview.get('subsystems_count', 0)} saudáveis", file=out)
+            print(f"   📊 Status geral: {overview.get('overall_status', 'unknown').upper()}", file=out)
         
-        print("\\n" + "🐘" + "=" * 70 + "🐘")
-        print("            MAMUTE AVANÇADO INICIALIZADO COM SUCESSO!")
-        print("🐘" + "=" * 70 + "🐘")
+        await mamute_advanced.flush_notifications()
         
-        print("\\n💡 Funcionalidades disponíveis:")
-        print("   🔧 Dashboard administrativo avançado")
-        print("   💾 Sistema de backup automático")
-        print("   🔄 Utilitários de migração de dados")
-        print("   📢 Sistema de notificações em tempo real")
-        print("   📊 Análise de performance avançada")
-        print("   📋 Geração automática de relatórios")
+        print("\\n" + "🐘" + "=" * 70 + "🐘", file=out)
+        print("            MAMUTE AVANÇADO INICIALIZADO COM SUCESSO!", file=out)
+        print("🐘" + "=" * 70 + "🐘", file=out)
         
-        print("\\n🌐 Para acessar a interface web:")
-        print("   python web_app.py")
-        print("   http://localhost:8000")
+        print("\\n💡 Funcionalidades disponíveis:", file=out)
+        print("   🔧 Dashboard administrativo avançado", file=out)
+        print("   💾 Sistema de backup automático", file=out)
+        print("   🔄 Utilitários de migração de dados", file=out)
+        print("   📢 Sistema de notificações em tempo real", file=out)
+        print("   📊 Análise de performance avançada", file=out)
+        print("   📋 Geração automática de relatórios", file=out)
+        
+        print("\\n🌐 Para acessar a interface web:", file=out)
+        print("   python web_app.py", file=out)
+        print("   http://localhost:8000", file=out)
         
     except Exception as e:
-        print(f"\\n❌ Erro durante inicialização: {e}")
+        print(f"\\n❌ Erro durante inicialização: {e}", file=out)
+    
+    flush_output()
 
 if __name__ == "__main__":
+    install_event_loop_policy()
     asyncio.run(main())
\ No newline at end of file
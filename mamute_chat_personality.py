@@ -6,19 +6,96 @@ Interface amigável e interativa similar ao GitHub Copilot
 
 import asyncio
 import json
+import random
+import re
+import time
+import uuid
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import cached_property
+from collections import OrderedDict, deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, AsyncIterator
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+    asyncpg = None
+
 from src.database.connection import DatabaseManager
 from src.utils.config import Config
 from src.utils.logger import setup_logger
-from src.ai.embeddings import EmbeddingManager
-from src.ai.agent import AIAgent
-from src.ai.fallback_chat import FallbackChatSystem
+from src.utils.cache import RedisCache
 from mamute_personality import MamutePersonality
 from mamute_proactive_ai import MamuteProactiveIA
 
+# Cache de respostas: apenas tipos determinísticos são reaproveitados
+_CACHEABLE_TYPES = frozenset({'search_success', 'help'})
+_RESPONSE_CACHE_SIZE = 512
+# Cache semântico: consultas com similaridade de cosseno >= limiar reaproveitam a resposta
+_SEMANTIC_CACHE_SIZE = 256
+_SEMANTIC_CACHE_THRESHOLD = 0.95
+_SEMANTIC_QUERY_TYPES = frozenset({'search', 'question'})
+# Respostas rápidas: (modelo, categoria do emoji); o emoji é sorteado na hora
+_RETURNING_GREETINGS = (
+    ("Oi de novo! {emoji}", 'greeting'),
+    ("Olá! Que bom que voltou! {emoji}", 'love'),
+    ("E aí! Pronto para mais descobertas? {emoji}", 'celebration'),
+)
+_COMPLIMENT_RESPONSES = (
+    ("Que bom que gostou! {emoji} Fico feliz em ajudar!", 'love'),
+    ("Obrigado! {emoji} Adoro quando consigo ser útil!", 'love'),
+    ("Fico muito feliz com isso! {emoji} Vamos continuar explorando!", 'celebration'),
+    ("Que alegria! {emoji} É um prazer trabalhar com você!", 'love'),
+)
+
+# Lote de embeddings: consultas concorrentes dentro da janela viram uma requisição
+_EMBED_BATCH_SIZE = 32
+_EMBED_BATCH_WINDOW = 0.005
+# Destino dos trechos de resposta do turno atual (definido por stream_response)
+_delta_sink: ContextVar[Optional[asyncio.Queue]] = ContextVar('_delta_sink', default=None)
+# Validade (segundos) da contagem de documentos em memória
+_DOC_COUNT_TTL = 60.0
+_DOC_COUNT_ESTIMATE_SQL = "SELECT reltuples::BIGINT AS total FROM pg_class WHERE relname = 'documents'"
+_DOC_COUNT_EXACT_SQL = "SELECT COUNT(*) AS total FROM documents"
+
+# Palavras-chave por tipo de consulta, em ordem de prioridade
+_QUERY_TYPE_KEYWORDS = (
+    # Comandos do modo proativo
+    ('proactive_command', ['aplicar', 'ativar proativo', 'modo proativo']),
+    # Solicitações de melhoria
+    ('improvement_request', ['melhorar', 'otimizar', 'corrigir', 'acelerar']),
+    # Saudações expandidas
+    ('greeting', ['oi', 'olá', 'ola', 'hey', 'bom dia', 'boa tarde', 'boa noite',
+                  'e aí', 'fala aí', 'como vai', 'tudo bem', 'hello', 'hi']),
+    # Elogios/Feedback positivo
+    ('compliment', ['obrigado', 'obrigada', 'valeu', 'legal', 'muito bom', 'excelente',
+                    'perfeito', 'adorei', 'gostei', 'incrível', 'top', 'show']),
+    # Pedidos de ajuda
+    ('help', ['ajuda', 'help', 'socorro', 'como', 'comandos', 'o que você faz',
+              'que você pode fazer', 'funcionalidades', 'opções']),
+    # Análises
+    ('analysis', ['analisar', 'analise', 'análise', 'gráfico', 'grafico', 'chart',
+                  'resumir', 'resumo', 'comparar', 'comparação', 'insights']),
+    # Busca/Pesquisa
+    ('search', ['buscar', 'procurar', 'encontrar', 'pesquisar', 'search', 'find',
+                'onde está', 'tem informação sobre', 'sabe sobre']),
+    # Estatísticas
+    ('stats', ['estatísticas', 'estatisticas', 'stats', 'números', 'quantos',
+               'total', 'contagem', 'dados da sessão']),
+)
+
+# Uma regex compilada por tipo: cada categoria é verificada em uma única passada
+_QUERY_TYPE_PATTERNS = tuple(
+    (query_type, re.compile('|'.join(map(re.escape, keywords))))
+    for query_type, keywords in _QUERY_TYPE_KEYWORDS
+)
+
 class MamuteChatIA:
     """Sistema de Chat IA Mamute com personalidade avançada"""
     
@@ -27,67 +104,157 @@ class MamuteChatIA:
         self.config = Config(config_file)
         self.logger = setup_logger("MamuteChatIA")
         
-        # Componentes principais
+        # Componentes principais (embeddings, agente e fallback são criados no primeiro uso)
         self.db_manager = DatabaseManager(self.config)
-        self.embedding_manager = EmbeddingManager(self.config)
-        self.ai_agent = AIAgent(self.config)
-        self.fallback_system = FallbackChatSystem()
         
         # Sistema de personalidade
-        self.personality = MamutePersonality()        
+        self.personality = MamutePersonality()
+        # Emojis por categoria capturados uma vez; o sorteio continua a cada uso
+        self._emo = {category: self.personality.get_emoji_pool(category)
+                     for category in self.personality.emojis}
+        # Textos invariáveis na sessão (ajuda e dicas de boas-vindas)
+        self._build_static_texts()
+        
         # IA Proativa para aplicar melhorias automaticamente
         self.proactive_ai = MamuteProactiveIA(config_file)
+        # Paráfrases reaproveitam respostas memoizadas usando o lote de embeddings da sessão
+        self.proactive_ai.embed_fn = self._query_embedding
         self.proactive_mode = True  # Modo proativo ativado por padrão        
         # Estado da sessão
+        self.session_id = uuid.uuid4().hex[:12]
         self.session_start = datetime.now()
-        self.conversation_history: List[Dict] = []
+        # Histórico limitado: turnos antigos são descartados em O(1)
+        self.conversation_history: deque = deque(maxlen=self.config.history_maxlen or 200)
         self.user_preferences = {}
         
+        # Cache de respostas: exato (entrada normalizada) e semântico (embeddings)
+        self._exact_cache: OrderedDict = OrderedDict()
+        # Semântico: matriz [N, D] de embeddings normalizados (buffer circular) + respostas
+        self._sem_matrix: Optional[np.ndarray] = None
+        self._sem_rows: List[Dict[str, Any]] = []
+        self._sem_next = 0
+        # Cache compartilhado entre processos (desativado sem REDIS_URL)
+        self.cache = RedisCache(self.config.redis_url, ttl=300)
+        # Fila de embeddings em lote (criada no primeiro uso, dentro do event loop)
+        self._embed_queue: Optional[asyncio.Queue] = None
+        self._embed_task: Optional[asyncio.Task] = None
+        # Limite de chamadas simultâneas a embeddings/LLM neste processo
+        self._llm_sem = asyncio.Semaphore(self.config.max_concurrent_llm or 16)
+        self.llm_stats = {'in_flight': 0, 'calls': 0, 'wait_time_total': 0.0, 'wait_time_max': 0.0}
+        # Contagem de documentos: (instante monotônico, valor); -inf = nunca consultada
+        self._doc_count_cache = (float('-inf'), 0)
+        # Pool asyncpg para consultas no próprio event loop (criado no primeiro uso)
+        self._pg_pool = None
+        self._pg_pool_lock = asyncio.Lock()
+        self._pg_pool_failed = False
+        
         # Estatísticas da sessão
         self.session_stats = {
             'queries': 0,
             'successful_queries': 0,
             'documents_found': 0,
-            'favorite_topics': [],
-            'session_time': timedelta(0)
+            'favorite_topics': []
         }
         
         self.logger.info("🚀 Sistema de Chat IA Mamute inicializado com personalidade avançada!")
+        
+        # Aquecer embeddings e banco em segundo plano (requer event loop ativo)
+        self._warmup_task: Optional[asyncio.Task] = None
+        try:
+            self._warmup_task = asyncio.get_running_loop().create_task(self._warmup())
+        except RuntimeError:
+            pass
+    
+    @classmethod
+    async def create(cls, config_file: str = ".env") -> "MamuteChatIA":
+        """Criar o chat dentro do event loop e aguardar o aquecimento"""
+        chat = cls(config_file)
+        await chat._warmup_task
+        return chat
+    
+    async def _warmup(self):
+        """Pagar o custo de primeira conexão antes da primeira consulta do usuário"""
+        results = await asyncio.gather(
+            self._embed("warmup"),
+            self.aget_document_count(),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.debug(f"Aquecimento incompleto: {result}")
+    
+    @property
+    def session_time(self) -> timedelta:
+        """Duração da sessão até agora (calculada sob demanda)"""
+        return datetime.now() - self.session_start
+    
+    @cached_property
+    def embedding_manager(self):
+        """Gerenciador de embeddings (criado no primeiro uso)"""
+        from src.ai.embeddings import EmbeddingManager
+        return EmbeddingManager(self.config, self.db_manager)
+    
+    @cached_property
+    def ai_agent(self):
+        """Agente de IA (criado no primeiro uso)"""
+        from src.ai.agent import AIAgent
+        return AIAgent(self.config, self.db_manager)
+    
+    @cached_property
+    def fallback_system(self):
+        """Sistema de chat fallback (criado no primeiro uso)"""
+        from src.ai.fallback_chat import FallbackChatSystem
+        return FallbackChatSystem(self.config, self.config.ai_name, self.db_manager)
+    
+    async def _component(self, name: str):
+        """Obter um componente preguiçoso sem bloquear o event loop na sua criação"""
+        return await asyncio.to_thread(getattr, self, name)
+    
+    def _build_static_texts(self):
+        """Montar uma vez por sessão os textos que não variam entre chamadas"""
+        self._help_text = self.personality.format_help_response()
+        
+        # Dicas úteis personalizadas
+        tips_emoji = random.choice(self._emo['info'])
+        help_emoji = random.choice(self._emo['help'])
+        proactive_emoji = random.choice(self._emo['celebration'])
+        
+        tips = (f"\n\n{tips_emoji} **O que posso fazer por você:**\n"
+                "• Responder perguntas sobre seus dados 🤔\n"
+                "• Buscar informações específicas 🔍\n"
+                "• Criar análises e resumos 📊\n"
+                "• Gerar gráficos e visualizações 📈\n"
+                "• Conversar naturalmente sobre qualquer tópico 💬\n"
+                f"• **NOVO**: Aplicar melhorias automaticamente! {proactive_emoji}\n\n"
+                f"Digite 'ajuda' a qualquer momento! {help_emoji}")
+        
+        # Informação sobre modo proativo
+        proactive_info = (f"\n\n{proactive_emoji} **Modo Proativo Ativo!**\n"
+                         "✨ Agora eu não apenas sugiro melhorias - EU AS APLICO!\n"
+                         "🔧 Otimizações seguras são aplicadas automaticamente\n"
+                         "💡 Melhorias arriscadas pedem sua confirmação\n"
+                         "📊 Acompanhe todas as melhorias aplicadas em tempo real")
+        
+        self._welcome_tips = tips + proactive_info
     
     def get_welcome_message(self) -> Dict[str, Any]:
         """Gerar mensagem de boas-vindas personalizada"""
+        return self._build_welcome_message(self.get_document_count())
+    
+    async def aget_welcome_message(self) -> Dict[str, Any]:
+        """Gerar mensagem de boas-vindas sem bloquear o event loop na consulta ao banco"""
+        doc_count = await self.aget_document_count()
+        return self._build_welcome_message(doc_count)
+    
+    def _build_welcome_message(self, doc_count: int) -> Dict[str, Any]:
+        """Montar a mensagem de boas-vindas a partir da contagem de documentos"""
         greeting = self.personality.get_greeting()
         
         # Adicionar estatísticas se disponíveis
         stats_msg = ""
-        try:
-            doc_count = self.get_document_count()
-            if doc_count > 0:
-                stats_emoji = self.personality.get_emoji('data')
-                stats_msg = f"\n\nTenho acesso a {doc_count:,} documentos prontos para explorar! {stats_emoji}"
-        except Exception as e:
-            self.logger.warning(f"Erro ao obter contagem de documentos: {e}")
-        
-        # Dicas úteis personalizadas
-        tips_emoji = self.personality.get_emoji('info')
-        help_emoji = self.personality.get_emoji('help')
-        proactive_emoji = self.personality.get_emoji('celebration')
-        
-        tips = f"\n\n{tips_emoji} **O que posso fazer por você:**\n" + \
-               "• Responder perguntas sobre seus dados 🤔\n" + \
-               "• Buscar informações específicas 🔍\n" + \
-               "• Criar análises e resumos 📊\n" + \
-               "• Gerar gráficos e visualizações 📈\n" + \
-               "• Conversar naturalmente sobre qualquer tópico 💬\n" + \
-               f"• **NOVO**: Aplicar melhorias automaticamente! {proactive_emoji}\n\n" + \
-               f"Digite 'ajuda' a qualquer momento! {help_emoji}"
-        
-        # Informação sobre modo proativo
-        proactive_info = f"\n\n{proactive_emoji} **Modo Proativo Ativo!**\n" + \
-                        "✨ Agora eu não apenas sugiro melhorias - EU AS APLICO!\n" + \
-                        "🔧 Otimizações seguras são aplicadas automaticamente\n" + \
-                        "💡 Melhorias arriscadas pedem sua confirmação\n" + \
-                        "📊 Acompanhe todas as melhorias aplicadas em tempo real"
+        if doc_count > 0:
+            stats_emoji = random.choice(self._emo['data'])
+            stats_msg = f"\n\nTenho acesso a {doc_count:,} documentos prontos para explorar! {stats_emoji}"
         
         # Adicionar starter de conversa ocasional
         conversation_starter = ""
@@ -95,10 +262,10 @@ class MamuteChatIA:
             conversation_starter = f"\n\n{self.personality.get_conversation_starter()}"
         
         return {
-            'response': greeting + stats_msg + tips + proactive_info + conversation_starter,
+            'response': greeting + stats_msg + self._welcome_tips + conversation_starter,
             'type': 'welcome',
             'timestamp': datetime.now().isoformat(),
-            'session_id': id(self),
+            'session_id': self.session_id,
             'personality_mode': True,
             'proactive_mode': self.proactive_mode
         }
@@ -106,23 +273,49 @@ class MamuteChatIA:
     async def get_response(self, user_input: str, context: Dict = None) -> Dict[str, Any]:
         """Gerar resposta com personalidade avançada e melhorias automáticas"""
         try:
+            # Relógio lido uma única vez por turno
+            now = datetime.now()
+            timestamp = now.isoformat()
+            
             # Atualizar estatísticas
             self.session_stats['queries'] += 1
-            self.session_stats['session_time'] = datetime.now() - self.session_start
             
             # Adicionar à história da conversa
             self.conversation_history.append({
                 'user': user_input,
-                'timestamp': datetime.now().isoformat(),
+                'timestamp': timestamp,
                 'type': 'user_input'
             })
             
             # Log personalizado
-            thinking_emoji = self.personality.get_emoji('thinking')
-            self.logger.info(f"{thinking_emoji} Processando [{self._analyze_query_type(user_input)}]: {user_input[:50]}...")
+            query_type = self._analyze_query_type(user_input)
+            thinking_emoji = random.choice(self._emo['thinking'])
+            self.logger.info(f"{thinking_emoji} Processando [{query_type}]: {user_input[:50]}...")
+            
+            # Consultar cache de respostas (exato e, para buscas, semântico); respostas do
+            # modo proativo nunca são guardadas, então ele dispensa a consulta
+            use_proactive = self.proactive_mode and hasattr(self, 'proactive_ai')
+            cache_key = self._cache_key(user_input, context)
+            query_embedding = None
+            response = None
+            if not use_proactive:
+                response = self._exact_cache_get(cache_key)
+                if response is None and self.cache.available:
+                    response = await self.cache.get(self.cache.key(cache_key))
+                    if response is not None:
+                        self._cache_store(cache_key, None, response)
+                if response is None and query_type in _SEMANTIC_QUERY_TYPES:
+                    # Embedding calculado uma vez: serve ao cache semântico e à busca
+                    query_embedding = await self._query_embedding(user_input)
+                    # Cache semântico ignora o contexto: só vale para consultas sem contexto
+                    if not context:
+                        response = self._semantic_cache_get(query_embedding)
+            
+            if response is not None:
+                response = dict(response, timestamp=timestamp, cached=True)
             
             # Usar IA Proativa se habilitada
-            if self.proactive_mode and hasattr(self, 'proactive_ai'):
+            elif use_proactive:
                 response = await self.proactive_ai.analyze_and_improve(user_input, context)
                 
                 # Verificar se houve melhorias aplicadas
@@ -130,17 +323,24 @@ class MamuteChatIA:
                     self.session_stats['successful_queries'] += 1
                     
                     # Log das melhorias aplicadas
-                    success_emoji = self.personality.get_emoji('success')
+                    success_emoji = random.choice(self._emo['success'])
                     improvements_count = len(response['applied_improvements'])
                     self.logger.info(f"{success_emoji} Aplicadas {improvements_count} melhorias automaticamente!")
             else:
                 # Fallback para processamento normal
-                response = await self._process_standard_query(user_input, context)
+                response = await self._process_standard_query(user_input, context, query_embedding)
             
             # Adicionar toque de personalidade se não for resposta proativa
-            if not response.get('proactive_mode') and 'response' in response:
+            if not response.get('cached') and not response.get('proactive_mode') and 'response' in response:
                 response['response'] = self.personality.add_personality_touch(response['response'])
             
+            # Guardar respostas determinísticas para consultas repetidas
+            if not response.get('cached') and response.get('type') in _CACHEABLE_TYPES:
+                self._cache_store(cache_key, None if context else query_embedding, response)
+                await self.cache.set(self.cache.key(cache_key), response)
+            
+            response['session_id'] = self.session_id
+            
             # Adicionar à história
             self.conversation_history.append({
                 'assistant': response['response'],
@@ -152,7 +352,7 @@ class MamuteChatIA:
             return response
             
         except Exception as e:
-            error_emoji = self.personality.get_emoji('error')
+            error_emoji = random.choice(self._emo['error'])
             self.logger.error(f"Erro no processamento: {e}")
             
             error_response = self.personality.format_error_response(
@@ -164,10 +364,191 @@ class MamuteChatIA:
                 'response': error_response,
                 'type': 'error',
                 'timestamp': datetime.now().isoformat(),
+                'session_id': self.session_id,
                 'personality_mode': True
             }
     
-    async def _process_standard_query(self, user_input: str, context: Dict = None) -> Dict[str, Any]:
+    async def stream_response(self, user_input: str, context: Dict = None) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Gerar resposta em partes
+        
+        Produz {'delta': ..., 'type': 'search_stream'} à medida que o modelo
+        escreve e, por último, a resposta completa (a mesma de get_response).
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        
+        async def run() -> Dict[str, Any]:
+            try:
+                return await self.get_response(user_input, context)
+            finally:
+                queue.put_nowait(None)
+        
+        token = _delta_sink.set(queue)
+        try:
+            task = asyncio.create_task(run())
+        finally:
+            _delta_sink.reset(token)
+        
+        try:
+            while (delta := await queue.get()) is not None:
+                yield {'delta': delta, 'type': 'search_stream'}
+            yield await task
+        finally:
+            task.cancel()
+    
+    @staticmethod
+    def _normalize_query(query: str) -> str:
+        """Normalizar entrada para chave de cache (minúsculas, espaços colapsados)"""
+        return " ".join(query.lower().split())
+    
+    @classmethod
+    def _cache_key(cls, query: str, context: Dict = None) -> str:
+        """Chave de cache: entrada normalizada e contexto (a resposta depende de ambos)"""
+        key = cls._normalize_query(query)
+        if context:
+            key += "\x00" + json.dumps(context, sort_keys=True, default=str)
+        return key
+    
+    def _exact_cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Buscar resposta no cache exato (LRU)"""
+        response = self._exact_cache.get(key)
+        if response is not None:
+            self._exact_cache.move_to_end(key)
+        return response
+    
+    def _semantic_cache_get(self, embedding: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """Buscar resposta de consulta semanticamente equivalente"""
+        if embedding is None or not self._sem_rows:
+            return None
+        
+        # Vetores normalizados: um único produto matriz-vetor dá todas as similaridades
+        scores = self._sem_matrix[:len(self._sem_rows)] @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] >= _SEMANTIC_CACHE_THRESHOLD:
+            return self._sem_rows[best]
+        return None
+    
+    def _cache_store(self, key: str, embedding: Optional[np.ndarray], response: Dict[str, Any]):
+        """Guardar resposta nos caches exato e semântico"""
+        response = dict(response)
+        self._exact_cache[key] = response
+        self._exact_cache.move_to_end(key)
+        if len(self._exact_cache) > _RESPONSE_CACHE_SIZE:
+            self._exact_cache.popitem(last=False)
+        
+        if embedding is not None:
+            if self._sem_matrix is None:
+                self._sem_matrix = np.empty((_SEMANTIC_CACHE_SIZE, embedding.shape[0]), dtype=np.float32)
+            # Buffer circular: ao encher, sobrescreve a entrada mais antiga
+            row = self._sem_next
+            self._sem_matrix[row] = embedding
+            if row < len(self._sem_rows):
+                self._sem_rows[row] = response
+            else:
+                self._sem_rows.append(response)
+            self._sem_next = (row + 1) % _SEMANTIC_CACHE_SIZE
+    
+    async def invalidate_response_cache(self):
+        """Descartar respostas em cache (chamar após ingestão de documentos)"""
+        self._exact_cache.clear()
+        self._sem_rows.clear()
+        self._sem_next = 0
+        await self.cache.bump_version()
+    
+    async def _query_embedding(self, query: str) -> Optional[np.ndarray]:
+        """Obter embedding normalizado da consulta (None se indisponível)"""
+        try:
+            embedding = await self._embed(query)
+        except Exception as e:
+            self.logger.debug(f"Embedding indisponível para cache semântico: {e}")
+            return None
+        
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    async def _embed(self, text: str) -> List[float]:
+        """Obter embedding via fila de lotes (agrupa consultas concorrentes)"""
+        if self._embed_queue is None:
+            self._embed_queue = asyncio.Queue()
+            self._embed_task = asyncio.create_task(self._embedding_batcher())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._embed_queue.put((text, future))
+        return await future
+    
+    async def _embedding_batcher(self):
+        """Agrupar pedidos de embedding e resolvê-los com uma única requisição"""
+        queue = self._embed_queue
+        items = []
+        try:
+            while True:
+                items = [await queue.get()]
+                # Janela curta para que pedidos concorrentes entrem no mesmo lote
+                await asyncio.sleep(_EMBED_BATCH_WINDOW)
+                while len(items) < _EMBED_BATCH_SIZE and not queue.empty():
+                    items.append(queue.get_nowait())
+                
+                texts = [text for text, _ in items]
+                try:
+                    embedding_manager = await self._component('embedding_manager')
+                    vectors = await asyncio.to_thread(embedding_manager.create_embeddings, texts)
+                    if len(vectors) != len(items):
+                        raise RuntimeError(
+                            f"create_embeddings retornou {len(vectors)} vetores para {len(items)} textos"
+                        )
+                except Exception as e:
+                    self._fail_embeddings(items, e)
+                    continue
+                
+                for (_, future), vector in zip(items, vectors):
+                    if not future.done():
+                        future.set_result(vector)
+        
+        except asyncio.CancelledError:
+            # Encerramento: nenhum chamador de _embed pode ficar esperando para sempre
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            self._fail_embeddings(items, RuntimeError("Fila de embeddings encerrada"))
+            raise
+    
+    @staticmethod
+    def _fail_embeddings(items: List[tuple], error: Exception):
+        """Propagar o erro para os pedidos de embedding ainda pendentes"""
+        for _, future in items:
+            if not future.done():
+                future.set_exception(error)
+    
+    @asynccontextmanager
+    async def _llm_slot(self):
+        """Reservar uma vaga no semáforo de embeddings/LLM, registrando a espera"""
+        started = time.perf_counter()
+        async with self._llm_sem:
+            waited = time.perf_counter() - started
+            stats = self.llm_stats
+            stats['calls'] += 1
+            stats['wait_time_total'] += waited
+            stats['wait_time_max'] = max(stats['wait_time_max'], waited)
+            stats['in_flight'] += 1
+            try:
+                yield
+            finally:
+                stats['in_flight'] -= 1
+    
+    def get_llm_stats(self) -> Dict[str, Any]:
+        """Obter métricas de concorrência das chamadas de embeddings/LLM"""
+        stats = self.llm_stats
+        calls = stats['calls']
+        return {
+            'in_flight': stats['in_flight'],
+            'limit': self.config.max_concurrent_llm or 16,
+            'calls': calls,
+            'avg_wait_ms': round(stats['wait_time_total'] / calls * 1000, 2) if calls else 0.0,
+            'max_wait_ms': round(stats['wait_time_max'] * 1000, 2)
+        }
+    
+    async def _process_standard_query(self, user_input: str, context: Dict = None,
+                                      query_embedding: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Processar consulta usando método padrão (fallback)"""
         # Analisar tipo de consulta
         query_type = self._analyze_query_type(user_input)
@@ -180,9 +561,9 @@ class MamuteChatIA:
         elif query_type == 'compliment':
             return self._handle_compliment(user_input)
         elif query_type == 'stats':
-            return self._handle_stats_request()
+            return await self._handle_stats_request()
         elif query_type in ['search', 'question']:
-            return await self._handle_search_query(user_input, context)
+            return await self._handle_search_query(user_input, context, query_embedding)
         elif query_type == 'analysis':
             return await self._handle_analysis_request(user_input)
         else:
@@ -195,7 +576,7 @@ class MamuteChatIA:
         else:
             self.proactive_mode = enabled
         
-        mode_emoji = self.personality.get_emoji('success' if self.proactive_mode else 'info')
+        mode_emoji = random.choice(self._emo['success' if self.proactive_mode else 'info'])
         status = "ATIVADO" if self.proactive_mode else "DESATIVADO"
         self.logger.info(f"{mode_emoji} Modo Proativo {status}")
         
@@ -205,49 +586,9 @@ class MamuteChatIA:
         """Analisar tipo de consulta com melhor detecção"""
         query_lower = query.lower().strip()
         
-        # Comandos do modo proativo
-        if any(term in query_lower for term in ['aplicar', 'ativar proativo', 'modo proativo']):
-            return 'proactive_command'
-        
-        # Solicitações de melhoria
-        if any(term in query_lower for term in ['melhorar', 'otimizar', 'corrigir', 'acelerar']):
-            return 'improvement_request'
-        
-        # Saudações expandidas
-        greetings = ['oi', 'olá', 'ola', 'hey', 'bom dia', 'boa tarde', 'boa noite', 
-                    'e aí', 'fala aí', 'como vai', 'tudo bem', 'hello', 'hi']
-        if any(greeting in query_lower for greeting in greetings):
-            return 'greeting'
-        
-        # Elogios/Feedback positivo
-        compliments = ['obrigado', 'obrigada', 'valeu', 'legal', 'muito bom', 'excelente',
-                      'perfeito', 'adorei', 'gostei', 'incrível', 'top', 'show']
-        if any(compliment in query_lower for compliment in compliments):
-            return 'compliment'
-        
-        # Pedidos de ajuda
-        help_terms = ['ajuda', 'help', 'socorro', 'como', 'comandos', 'o que você faz',
-                     'que você pode fazer', 'funcionalidades', 'opções']
-        if any(term in query_lower for term in help_terms):
-            return 'help'
-        
-        # Análises
-        analysis_terms = ['analisar', 'analise', 'análise', 'gráfico', 'grafico', 'chart',
-                         'resumir', 'resumo', 'comparar', 'comparação', 'insights']
-        if any(term in query_lower for term in analysis_terms):
-            return 'analysis'
-        
-        # Busca/Pesquisa
-        search_terms = ['buscar', 'procurar', 'encontrar', 'pesquisar', 'search', 'find',
-                       'onde está', 'tem informação sobre', 'sabe sobre']
-        if any(term in query_lower for term in search_terms):
-            return 'search'
-        
-        # Estatísticas
-        stats_terms = ['estatísticas', 'estatisticas', 'stats', 'números', 'quantos',
-                      'total', 'contagem', 'dados da sessão']
-        if any(term in query_lower for term in stats_terms):
-            return 'stats'
+        for query_type, pattern in _QUERY_TYPE_PATTERNS:
+            if pattern.search(query_lower):
+                return query_type
         
         # Perguntas (contém '?')
         if '?' in query:
@@ -259,13 +600,7 @@ class MamuteChatIA:
         """Lidar com saudações"""
         # Saudações variadas baseadas no histórico
         if len(self.conversation_history) > 2:
-            responses = [
-                f"Oi de novo! {self.personality.get_emoji('greeting')}",
-                f"Olá! Que bom que voltou! {self.personality.get_emoji('love')}",
-                f"E aí! Pronto para mais descobertas? {self.personality.get_emoji('celebration')}"
-            ]
-            import random
-            greeting = random.choice(responses)
+            greeting = self._pick_template(_RETURNING_GREETINGS)
         else:
             greeting = self.personality.get_greeting()
         
@@ -276,17 +611,14 @@ class MamuteChatIA:
             'personality_mode': True
         }
     
+    def _pick_template(self, templates: tuple) -> str:
+        """Sortear um modelo de resposta e resolver apenas o seu emoji"""
+        template, emoji_category = random.choice(templates)
+        return template.format(emoji=random.choice(self._emo[emoji_category]))
+    
     def _handle_compliment(self, user_input: str) -> Dict[str, Any]:
         """Lidar com elogios e feedback positivo"""
-        compliment_responses = [
-            f"Que bom que gostou! {self.personality.get_emoji('love')} Fico feliz em ajudar!",
-            f"Obrigado! {self.personality.get_emoji('love')} Adoro quando consigo ser útil!",
-            f"Fico muito feliz com isso! {self.personality.get_emoji('celebration')} Vamos continuar explorando!",
-            f"Que alegria! {self.personality.get_emoji('love')} É um prazer trabalhar com você!"
-        ]
-        
-        import random
-        response = random.choice(compliment_responses)
+        response = self._pick_template(_COMPLIMENT_RESPONSES)
         
         # Adicionar motivação
         motivation = self.personality.get_motivational()
@@ -302,22 +634,23 @@ class MamuteChatIA:
     def _handle_help_request(self) -> Dict[str, Any]:
         """Lidar com pedidos de ajuda"""
         return {
-            'response': self.personality.format_help_response(),
+            'response': self._help_text,
             'type': 'help',
             'timestamp': datetime.now().isoformat(),
             'personality_mode': True
         }
     
-    def _handle_stats_request(self) -> Dict[str, Any]:
+    async def _handle_stats_request(self) -> Dict[str, Any]:
         """Lidar com pedidos de estatísticas"""
         try:
-            # Coletar estatísticas reais
+            # Coletar estatísticas reais (COUNT(*) exato, sem bloquear o event loop)
+            doc_count = await self.aget_document_count(exact=True)
             stats = {
-                'documents': self.get_document_count(),
+                'documents': doc_count,
                 'session_queries': self.session_stats['queries'],
                 'successful_queries': self.session_stats['successful_queries'],
                 'documents_found': self.session_stats['documents_found'],
-                'session_time': str(self.session_stats['session_time']).split('.')[0],
+                'session_time': str(self.session_time).split('.')[0],
                 'start_time': self.session_start.strftime('%H:%M:%S')
             }
             
@@ -341,26 +674,40 @@ class MamuteChatIA:
                 'personality_mode': True
             }
     
-    async def _handle_search_query(self, query: str, context: Dict = None) -> Dict[str, Any]:
+    async def _handle_search_query(self, query: str, context: Dict = None,
+                                   query_embedding: Optional[np.ndarray] = None) -> Dict[str, Any]:
         """Lidar com consultas de busca"""
+        fallback_task = None
         try:
             # Resposta inicial de busca
             search_msg = self.personality.get_response('search_start')
             
-            # Realizar busca semântica
-            search_results = await self.embedding_manager.search_documents(
-                query, 
-                limit=self.config.search_limit if hasattr(self.config, 'search_limit') else 5
-            )
+            # Fallback especulativo em paralelo (só é aguardado se a busca vier vazia);
+            # respostas que consultam o banco só rodam depois de uma busca vazia, pois
+            # cancelar a tarefa não interrompe a thread
+            if not await self._fallback_uses_database(query):
+                fallback_task = asyncio.create_task(self._fallback_response(query))
+            
+            # Realizar busca semântica (reaproveita o embedding do cache ou usa a fila de lotes)
+            async with self._llm_slot():
+                if query_embedding is None:
+                    query_embedding = await self._embed(query)
+                embedding_manager = await self._component('embedding_manager')
+                search_results = await asyncio.to_thread(
+                    embedding_manager.search_by_embedding,
+                    query_embedding,
+                    self.config.search_limit if hasattr(self.config, 'search_limit') else 5
+                )
             
             if search_results:
+                if fallback_task is not None:
+                    fallback_task.cancel()
                 self.session_stats['successful_queries'] += 1
                 self.session_stats['documents_found'] += len(search_results)
                 
                 # Gerar resposta contextualizada
-                context_response = await self.ai_agent.generate_response(
-                    query, search_results, context
-                )
+                async with self._llm_slot():
+                    context_response = await self._generate_answer(query, search_results, context)
                 
                 # Formatar resposta de sucesso
                 response_text = self.personality.format_success_response(
@@ -380,16 +727,18 @@ class MamuteChatIA:
                 # Sem resultados - resposta empática
                 no_results_response = self.personality.get_response('no_results')
                 
-                # Tentar fallback
-                fallback_response = await self.fallback_system.get_response(query)
+                # Tentar fallback (em andamento desde o início da busca, quando especulativo)
+                if fallback_task is None:
+                    fallback_task = asyncio.create_task(self._fallback_response(query))
+                fallback_response = await fallback_task
                 if fallback_response:
                     response_text = f"{no_results_response}\n\n💡 **Tentativa alternativa:**\n{fallback_response}"
                 else:
-                    response_text = f"{no_results_response}\n\n🎯 **Sugestões:**\n" + \
-                                  "• Tente termos mais gerais\n" + \
-                                  "• Use sinônimos\n" + \
-                                  "• Reformule a pergunta\n" + \
-                                  "• Ou me pergunte sobre outro assunto!"
+                    response_text = (f"{no_results_response}\n\n🎯 **Sugestões:**\n"
+                                   "• Tente termos mais gerais\n"
+                                   "• Use sinônimos\n"
+                                   "• Reformule a pergunta\n"
+                                   "• Ou me pergunte sobre outro assunto!")
                 
                 return {
                     'response': response_text,
@@ -399,6 +748,8 @@ class MamuteChatIA:
                 }
                 
         except Exception as e:
+            if fallback_task is not None:
+                fallback_task.cancel()
             error_response = self.personality.format_error_response(
                 f"Problema na busca: {str(e)}",
                 "Que tal tentar uma pergunta diferente?"
@@ -411,18 +762,54 @@ class MamuteChatIA:
                 'personality_mode': True
             }
     
+    async def _generate_answer(self, query: str, documents: List[Dict[str, Any]],
+                               context: Dict = None) -> str:
+        """Gerar resposta com o agente, repassando cada trecho ao stream do turno"""
+        sink = _delta_sink.get()
+        history = context if isinstance(context, list) else None
+        ai_agent = await self._component('ai_agent')
+        chunks = iter(ai_agent.stream_response(query, documents, history))
+        
+        parts = []
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            parts.append(chunk)
+            if sink is not None:
+                sink.put_nowait(chunk)
+        return "".join(parts)
+    
+    async def _fallback_uses_database(self, query: str) -> bool:
+        """Indica se o fallback consultaria o banco (na dúvida, assume que sim)"""
+        try:
+            fallback_system = await self._component('fallback_system')
+            return fallback_system.uses_database(query)
+        except Exception as e:
+            self.logger.debug(f"Roteamento do fallback indisponível: {e}")
+            return True
+    
+    async def _fallback_response(self, query: str) -> Optional[str]:
+        """Obter resposta do sistema fallback sem bloquear o event loop (None se falhar)"""
+        try:
+            fallback_system = await self._component('fallback_system')
+            result = await asyncio.to_thread(
+                fallback_system.generate_response, query, self.session_id
+            )
+        except Exception as e:
+            self.logger.debug(f"Fallback indisponível: {e}")
+            return None
+        return result.get('response')
+    
     async def _handle_analysis_request(self, query: str) -> Dict[str, Any]:
         """Lidar com pedidos de análise"""
         try:
             analysis_msg = self.personality.get_response('analysis')
             
             # Simular análise (aqui você integraria com seus sistemas de análise)
-            analysis_result = f"Análise para: {query}\n\n" + \
-                            "📊 **Resultados da Análise:**\n" + \
-                            "• Processamento concluído\n" + \
-                            "• Dados analisados com sucesso\n" + \
-                            "• Insights gerados\n\n" + \
-                            "💡 **Próximos passos:** Que tal explorar aspectos específicos?"
+            analysis_result = (f"Análise para: {query}\n\n"
+                             "📊 **Resultados da Análise:**\n"
+                             "• Processamento concluído\n"
+                             "• Dados analisados com sucesso\n"
+                             "• Insights gerados\n\n"
+                             "💡 **Próximos passos:** Que tal explorar aspectos específicos?")
             
             response_text = self.personality.format_analysis_response(analysis_result)
             
@@ -452,21 +839,21 @@ class MamuteChatIA:
             thinking_response = self.personality.get_response('thinking_response')
             
             # Tentar com fallback primeiro
-            fallback_response = await self.fallback_system.get_response(query)
+            fallback_response = await self._fallback_response(query)
             
             if fallback_response:
                 response_text = f"{thinking_response}\n\n{fallback_response}"
             else:
                 # Resposta padrão empática
-                response_text = f"{thinking_response}\n\n" + \
-                              "Não tenho uma resposta específica para isso, mas adoraria ajudar! " + \
-                              f"{self.personality.get_emoji('help')}\n\n" + \
-                              "🎯 **Posso ajudar com:**\n" + \
-                              "• Buscar informações nos documentos\n" + \
-                              "• Fazer análises de dados\n" + \
-                              "• Responder perguntas específicas\n" + \
-                              "• Criar resumos e insights\n\n" + \
-                              "Me dê mais detalhes sobre o que você precisa!"
+                response_text = (f"{thinking_response}\n\n"
+                               "Não tenho uma resposta específica para isso, mas adoraria ajudar! "
+                               f"{random.choice(self._emo['help'])}\n\n"
+                               "🎯 **Posso ajudar com:**\n"
+                               "• Buscar informações nos documentos\n"
+                               "• Fazer análises de dados\n"
+                               "• Responder perguntas específicas\n"
+                               "• Criar resumos e insights\n\n"
+                               "Me dê mais detalhes sobre o que você precisa!")
             
             return {
                 'response': response_text,
@@ -488,43 +875,127 @@ class MamuteChatIA:
                 'personality_mode': True
             }
     
-    def get_document_count(self) -> int:
-        """Obter número total de documentos"""
+    def get_document_count(self, exact: bool = False) -> int:
+        """
+        Obter número total de documentos
+        
+        Por padrão usa a estimativa do catálogo (pg_class.reltuples), mantida
+        em memória por _DOC_COUNT_TTL segundos; COUNT(*) só é executado quando
+        exact=True (pedido explícito de estatísticas).
+        """
+        ts, value = self._doc_count_cache
+        if not exact and time.monotonic() - ts < _DOC_COUNT_TTL:
+            return value
+        
         try:
-            with self.db_manager.get_connection() as conn:
-                result = conn.execute("SELECT COUNT(*) FROM documents")
-                return result.fetchone()[0]
+            value = -1
+            if not exact:
+                rows = self.db_manager.execute_query(_DOC_COUNT_ESTIMATE_SQL)
+                value = rows[0]['total'] if rows else -1
+            # Tabela nunca analisada (reltuples = -1): usar contagem exata
+            if value < 0:
+                rows = self.db_manager.execute_query(_DOC_COUNT_EXACT_SQL)
+                value = rows[0]['total']
         except Exception as e:
             self.logger.warning(f"Erro ao obter contagem de documentos: {e}")
             return 0
+        
+        self._doc_count_cache = (time.monotonic(), value)
+        return value
+    
+    async def aget_document_count(self, exact: bool = False) -> int:
+        """
+        Versão assíncrona de get_document_count
+        
+        Usa o pool asyncpg quando disponível; sem ele, executa a versão
+        síncrona em uma thread.
+        """
+        ts, value = self._doc_count_cache
+        if not exact and time.monotonic() - ts < _DOC_COUNT_TTL:
+            return value
+        
+        pool = await self._get_pool()
+        if pool is None:
+            return await asyncio.to_thread(self.get_document_count, exact)
+        
+        try:
+            value = -1
+            if not exact:
+                value = await pool.fetchval(_DOC_COUNT_ESTIMATE_SQL)
+                value = -1 if value is None else value
+            # Tabela nunca analisada (reltuples = -1): usar contagem exata
+            if value < 0:
+                value = await pool.fetchval(_DOC_COUNT_EXACT_SQL)
+        except Exception as e:
+            self.logger.warning(f"Erro ao obter contagem de documentos: {e}")
+            return 0
+        
+        self._doc_count_cache = (time.monotonic(), value)
+        return value
+    
+    async def _get_pool(self):
+        """Obter o pool asyncpg, criando-o na primeira chamada (None se indisponível)"""
+        if self._pg_pool is not None or self._pg_pool_failed:
+            return self._pg_pool
+        if not ASYNCPG_AVAILABLE or not self.config.database_url:
+            self._pg_pool_failed = True
+            return None
+        
+        async with self._pg_pool_lock:
+            if self._pg_pool is None and not self._pg_pool_failed:
+                try:
+                    self._pg_pool = await asyncpg.create_pool(
+                        self.config.database_url, min_size=1, max_size=5
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Pool asyncpg indisponível, usando conexão síncrona: {e}")
+                    self._pg_pool_failed = True
+        return self._pg_pool
+    
+    async def close(self):
+        """Liberar recursos assíncronos (pool do banco e fila de embeddings)"""
+        if self._embed_task is not None:
+            task, self._embed_task, self._embed_queue = self._embed_task, None, None
+            task.cancel()
+            # Aguardar o batcher falhar os pedidos pendentes antes de retornar
+            await asyncio.gather(task, return_exceptions=True)
+        if self._pg_pool is not None:
+            await self._pg_pool.close()
+            self._pg_pool = None
+    
+    def invalidate_doc_count(self):
+        """Descartar a contagem em memória (chamar após ingestão de documentos)"""
+        self._doc_count_cache = (float('-inf'), 0)
     
     def get_session_summary(self) -> Dict[str, Any]:
         """Obter resumo da sessão"""
-        session_time = datetime.now() - self.session_start
+        now = datetime.now()
+        session_time = now - self.session_start
         
-        summary_emoji = self.personality.get_emoji('data')
-        celebration_emoji = self.personality.get_emoji('celebration')
+        summary_emoji = random.choice(self._emo['data'])
+        celebration_emoji = random.choice(self._emo['celebration'])
         
         summary = {
+            'session_id': self.session_id,
             'session_duration': str(session_time).split('.')[0],
             'total_queries': self.session_stats['queries'],
             'successful_queries': self.session_stats['successful_queries'],
             'documents_found': self.session_stats['documents_found'],
             'conversation_turns': len(self.conversation_history),
             'start_time': self.session_start.strftime('%H:%M:%S'),
-            'end_time': datetime.now().strftime('%H:%M:%S')
+            'end_time': now.strftime('%H:%M:%S')
         }
         
-        summary_text = f"Resumo da nossa conversa! {summary_emoji}\n\n" + \
-                      f"⏰ **Duração:** {summary['session_duration']}\n" + \
-                      f"💬 **Conversas:** {summary['conversation_turns']} mensagens\n" + \
-                      f"🔍 **Consultas:** {summary['total_queries']}\n" + \
-                      f"✅ **Sucessos:** {summary['successful_queries']}\n" + \
-                      f"📄 **Documentos encontrados:** {summary['documents_found']}\n\n" + \
-                      f"Foi um prazer conversar! {celebration_emoji}"
+        summary_text = (f"Resumo da nossa conversa! {summary_emoji}\n\n"
+                       f"⏰ **Duração:** {summary['session_duration']}\n"
+                       f"💬 **Conversas:** {summary['conversation_turns']} mensagens\n"
+                       f"🔍 **Consultas:** {summary['total_queries']}\n"
+                       f"✅ **Sucessos:** {summary['successful_queries']}\n"
+                       f"📄 **Documentos encontrados:** {summary['documents_found']}\n\n"
+                       f"Foi um prazer conversar! {celebration_emoji}")
         
         return {
             'summary': summary,
             'formatted_summary': summary_text,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': now.isoformat()
         }
\ No newline at end of file
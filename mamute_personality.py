@@ -5,116 +5,235 @@ Implementa uma interface interativa e amigável similar ao GitHub Copilot
 """
 
 import random
+import re
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+# Emojis por categoria (categoria desconhecida usa _DEFAULT_EMOJIS)
+_DEFAULT_EMOJIS = ('✨',)
+
+_EMOJIS = {
+    'greeting': ('👋', '😊', '🎉', '✨', '🚀', '💫'),
+    'thinking': ('🤔', '💭', '⚡', '🔍', '🧠', '⚙️'),
+    'success': ('✅', '🎯', '🏆', '💯', '🌟', '🎊'),
+    'info': ('ℹ️', '📋', '📊', '💡', '📝', '🔖'),
+    'warning': ('⚠️', '🔶', '📋', '⚡', '🔺'),
+    'error': ('❌', '🚨', '⛔', '🔧', '💥'),
+    'data': ('📊', '📈', '🔢', '💾', '🗃️', '📂'),
+    'search': ('🔍', '🔎', '🕵️', '🎯', '📱', '🔬'),
+    'time': ('⏰', '📅', '⌚', '🕐', '⏳', '⌛'),
+    'celebration': ('🎉', '🚀', '✨', '🎊', '🌟', '💫'),
+    'help': ('🆘', '💪', '🤝', '🛠️', '🎯', '💡'),
+    'analysis': ('🔬', '📊', '⚡', '🧠', '📈', '🎯'),
+    'love': ('❤️', '💖', '😍', '🥰', '😘', '💕'),
+    'cool': ('😎', '🆒', '👌', '🔥', '⭐', '✨')
+}
+
+# Uma única regex com todos os emojis conhecidos (mais longos primeiro)
+_EMOJI_RE = re.compile('|'.join(map(re.escape, sorted(
+    {emoji for pool in _EMOJIS.values() for emoji in pool}, key=len, reverse=True
+))))
+
+# Primeiro code point de cada emoji: descarta rápido textos sem nenhum candidato
+_EMOJI_FIRST_CPS = frozenset(ord(emoji[0]) for pool in _EMOJIS.values() for emoji in pool)
+
+_GREETINGS = (
+    "Olá! Sou o Mamute IA, seu assistente inteligente! {emoji}",
+    "Oi! Como posso ajudar hoje? {emoji}",
+    "Bom te ver! Estou aqui para ajudar! {emoji}",
+    "Opa! Pronto para explorar dados juntos? {emoji}",
+    "E aí! Vamos descobrir algo interessante? {emoji}",
+    "Hey! Sua IA favorita chegou! {emoji}"
+)
+
+_RESPONSES = {
+    'search_start': (
+        "Deixa eu procurar isso para você! {emoji}",
+        "Vou vasculhar os dados! {emoji}",
+        "Buscando informações... {emoji}",
+        "Investigando... {emoji}",
+        "Explorando dados... {emoji}"
+    ),
+    'found': (
+        "Encontrei algo interessante! {emoji}",
+        "Aqui está o que achei! {emoji}",
+        "Ótimo! Veja só isso! {emoji}",
+        "Bingo! Encontrei! {emoji}",
+        "Achei algumas informações legais! {emoji}"
+    ),
+    'analysis': (
+        "Analisando os dados... {emoji}",
+        "Deixa eu dar uma olhada mais de perto! {emoji}",
+        "Processando informações... {emoji}",
+        "Vou fazer uma análise detalhada! {emoji}",
+        "Preparando insights... {emoji}"
+    ),
+    'help': (
+        "Claro! Estou aqui para isso! {emoji}",
+        "Com certeza! Vamos resolver! {emoji}",
+        "Pode deixar comigo! {emoji}",
+        "Vou te ajudar com prazer! {emoji}",
+        "Sempre pronto para ajudar! {emoji}"
+    ),
+    'error': (
+        "Ops! Algo deu errado, mas vamos resolver! {emoji}",
+        "Eita! Um problema apareceu, mas não desista! {emoji}",
+        "Ops! Vamos contornar isso! {emoji}",
+        "Hmm, algo não foi como esperado! {emoji}"
+    ),
+    'no_results': (
+        "Não encontrei resultados específicos, mas vamos tentar diferente! {emoji}",
+        "Hmm, nada por aqui... mas tenho outras ideias! {emoji}",
+        "Sem resultados diretos, mas posso ajudar de outro jeito! {emoji}",
+        "Não achei nada específico, mas vamos explorar! {emoji}"
+    ),
+    'thinking_response': (
+        "Hmm, interessante pergunta! {emoji}",
+        "Deixa eu pensar sobre isso... {emoji}",
+        "Boa pergunta! Vou analisar... {emoji}",
+        "Que legal! Vou processar isso... {emoji}"
+    )
+}
+
+_ENCOURAGEMENTS = (
+    "Você está indo bem! {emoji}",
+    "Ótima pergunta! {emoji}",
+    "Adoro quando você pergunta isso! {emoji}",
+    "Que interessante! {emoji}",
+    "Muito bem pensado! {emoji}",
+    "Excelente escolha! {emoji}"
+)
+
+# Frases motivacionais
+_MOTIVATIONAL = (
+    "Juntos vamos descobrir coisas incríveis! {emoji}",
+    "Cada pergunta nos leva mais longe! {emoji}",
+    "Adorei sua curiosidade! {emoji}",
+    "Vamos explorar juntos! {emoji}",
+    "Que aventura interessante! {emoji}"
+)
+
+_CONVERSATION_STARTERS = (
+    "Que tal explorarmos alguns dados juntos? {emoji}",
+    "Tenho curiosidade sobre o que você quer descobrir! {emoji}",
+    "Pronto para alguma descoberta interessante? {emoji}",
+    "Que pergunta legal podemos investigar? {emoji}",
+    "Vamos fazer alguma análise interessante? {emoji}"
+)
+
+# Campos que compõem a seção "Sessão Atual" das estatísticas
+_SESSION_STATS_KEYS = ('session_queries', 'session_time', 'start_time')
+
+# Texto de ajuda: só os três emojis variam entre chamadas
+_HELP_TEMPLATE = (
+    "Claro! Estou aqui para ajudar! %s\n\n"
+    "%s **Comandos Disponíveis:**\n\n"
+    "📋 **Consultas Gerais:**\n"
+    "• 'buscar [termo]' - Procurar documentos\n"
+    "• 'o que você sabe sobre [assunto]?' - Fazer perguntas\n"
+    "• 'quantos documentos temos?' - Ver estatísticas\n"
+    "• 'me explique [tópico]' - Explicações detalhadas\n\n"
+    "📊 **Análises:**\n"
+    "• 'analisar [dados]' - Análise detalhada\n"
+    "• 'criar gráfico de [dados]' - Gerar visualizações\n"
+    "• 'resumir [tópico]' - Resumos inteligentes\n"
+    "• 'comparar [item1] com [item2]' - Comparações\n\n"
+    "🎯 **Dicas Especiais:**\n"
+    "• Seja específico nas perguntas\n"
+    "• Use linguagem natural (como está fazendo!)\n"
+    "• Peça exemplos se precisar\n"
+    "• Fale comigo como se fosse um amigo\n\n"
+    "Pode testar qualquer comando! Adoro conversar! %s"
+)
+
+# Gerador próprio do módulo; _pick indexa a tupla diretamente
+_RNG = random.Random()
+_randrange = _RNG.randrange
+_getrandbits = _RNG.getrandbits
+
+# Chance de encorajamento em add_personality_touch: 13107/65536 ≈ 20%
+_ENCOURAGEMENT_THRESHOLD = 13107
+
+# Quantidade de emojis sorteados por vez em cada categoria
+_EMOJI_BUFFER_SIZE = 64
+
+def _pick(options: tuple):
+    """Sortear um item de uma tupla"""
+    return options[_randrange(len(options))]
+
+def _split_templates(templates: tuple) -> tuple:
+    """Separar cada modelo em (antes, depois) do marcador {emoji}"""
+    return tuple(tuple(template.split('{emoji}', 1)) for template in templates)
+
+# Modelos já separados: montar a frase é só concatenar, sem str.format
+_GREETINGS_SPLIT = _split_templates(_GREETINGS)
+_RESPONSES_SPLIT = {key: _split_templates(templates) for key, templates in _RESPONSES.items()}
+# Categoria de emoji de cada tipo de resposta: primeira palavra do tipo
+_RESPONSE_TO_CATEGORY = {key: key.split('_', 1)[0] for key in _RESPONSES}
+def _make_response_builder(templates: tuple, category: str):
+    """Criar a função que monta uma resposta de um tipo (modelo e categoria já resolvidos)"""
+    def build(personality: "MamutePersonality") -> str:
+        pre, post = _pick(templates)
+        return f"{pre}{personality.get_emoji(category)}{post}"
+    return build
+
+# Tipo de resposta -> montador: get_response faz uma única busca no dicionário
+_RESPONSE_BUILDERS = {
+    key: _make_response_builder(_RESPONSES_SPLIT[key], _RESPONSE_TO_CATEGORY[key])
+    for key in _RESPONSES
+}
+
+_ENCOURAGEMENTS_SPLIT = _split_templates(_ENCOURAGEMENTS)
+_MOTIVATIONAL_SPLIT = _split_templates(_MOTIVATIONAL)
+_CONVERSATION_STARTERS_SPLIT = _split_templates(_CONVERSATION_STARTERS)
+
+# Todas as combinações possíveis, renderizadas uma vez (6×6×6 ajudas, 5×6 iniciadores)
+_HELP_VARIANTS = tuple(
+    _HELP_TEMPLATE % (help_emoji, info_emoji, celebration_emoji)
+    for help_emoji in _EMOJIS['help']
+    for info_emoji in _EMOJIS['info']
+    for celebration_emoji in _EMOJIS['celebration']
+)
+_CONVERSATION_STARTER_VARIANTS = tuple(
+    f"{pre}{emoji}{post}"
+    for pre, post in _CONVERSATION_STARTERS_SPLIT
+    for emoji in _EMOJIS['thinking']
+)
+
 class MamutePersonality:
     """Sistema de personalidade avançado para a IA Mamute"""
     
+    # Único estado por instância: os emojis pré-sorteados
+    __slots__ = ('_emoji_buffers',)
+    
+    # Dados somente leitura compartilhados por todas as instâncias
+    emojis = _EMOJIS
+    greetings = _GREETINGS
+    responses = _RESPONSES
+    encouragements = _ENCOURAGEMENTS
+    motivational = _MOTIVATIONAL
+    
     def __init__(self):
-        self.emojis = {
-            'greeting': ['👋', '😊', '🎉', '✨', '🚀', '💫'],
-            'thinking': ['🤔', '💭', '⚡', '🔍', '🧠', '⚙️'],
-            'success': ['✅', '🎯', '🏆', '💯', '🌟', '🎊'],
-            'info': ['ℹ️', '📋', '📊', '💡', '📝', '🔖'],
-            'warning': ['⚠️', '🔶', '📋', '⚡', '🔺'],
-            'error': ['❌', '🚨', '⛔', '🔧', '💥'],
-            'data': ['📊', '📈', '🔢', '💾', '🗃️', '📂'],
-            'search': ['🔍', '🔎', '🕵️', '🎯', '📱', '🔬'],
-            'time': ['⏰', '📅', '⌚', '🕐', '⏳', '⌛'],
-            'celebration': ['🎉', '🚀', '✨', '🎊', '🌟', '💫'],
-            'help': ['🆘', '💪', '🤝', '🛠️', '🎯', '💡'],
-            'analysis': ['🔬', '📊', '⚡', '🧠', '📈', '🎯'],
-            'love': ['❤️', '💖', '😍', '🥰', '😘', '💕'],
-            'cool': ['😎', '🆒', '👌', '🔥', '⭐', '✨']
-        }
-        
-        self.greetings = [
-            "Olá! Sou o Mamute IA, seu assistente inteligente! {emoji}",
-            "Oi! Como posso ajudar hoje? {emoji}",
-            "Bom te ver! Estou aqui para ajudar! {emoji}",
-            "Opa! Pronto para explorar dados juntos? {emoji}",
-            "E aí! Vamos descobrir algo interessante? {emoji}",
-            "Hey! Sua IA favorita chegou! {emoji}"
-        ]
-        
-        self.responses = {
-            'search_start': [
-                "Deixa eu procurar isso para você! {emoji}",
-                "Vou vasculhar os dados! {emoji}",
-                "Buscando informações... {emoji}",
-                "Investigando... {emoji}",
-                "Explorando dados... {emoji}"
-            ],
-            'found': [
-                "Encontrei algo interessante! {emoji}",
-                "Aqui está o que achei! {emoji}",
-                "Ótimo! Veja só isso! {emoji}",
-                "Bingo! Encontrei! {emoji}",
-                "Achei algumas informações legais! {emoji}"
-            ],
-            'analysis': [
-                "Analisando os dados... {emoji}",
-                "Deixa eu dar uma olhada mais de perto! {emoji}",
-                "Processando informações... {emoji}",
-                "Vou fazer uma análise detalhada! {emoji}",
-                "Preparando insights... {emoji}"
-            ],
-            'help': [
-                "Claro! Estou aqui para isso! {emoji}",
-                "Com certeza! Vamos resolver! {emoji}",
-                "Pode deixar comigo! {emoji}",
-                "Vou te ajudar com prazer! {emoji}",
-                "Sempre pronto para ajudar! {emoji}"
-            ],
-            'error': [
-                "Ops! Algo deu errado, mas vamos resolver! {emoji}",
-                "Eita! Um problema apareceu, mas não desista! {emoji}",
-                "Ops! Vamos contornar isso! {emoji}",
-                "Hmm, algo não foi como esperado! {emoji}"
-            ],
-            'no_results': [
-                "Não encontrei resultados específicos, mas vamos tentar diferente! {emoji}",
-                "Hmm, nada por aqui... mas tenho outras ideias! {emoji}",
-                "Sem resultados diretos, mas posso ajudar de outro jeito! {emoji}",
-                "Não achei nada específico, mas vamos explorar! {emoji}"
-            ],
-            'thinking_response': [
-                "Hmm, interessante pergunta! {emoji}",
-                "Deixa eu pensar sobre isso... {emoji}",
-                "Boa pergunta! Vou analisar... {emoji}",
-                "Que legal! Vou processar isso... {emoji}"
-            ]
-        }
-        
-        self.encouragements = [
-            "Você está indo bem! {emoji}",
-            "Ótima pergunta! {emoji}",
-            "Adoro quando você pergunta isso! {emoji}",
-            "Que interessante! {emoji}",
-            "Muito bem pensado! {emoji}",
-            "Excelente escolha! {emoji}"
-        ]
-        
-        # Frases motivacionais
-        self.motivational = [
-            "Juntos vamos descobrir coisas incríveis! {emoji}",
-            "Cada pergunta nos leva mais longe! {emoji}",
-            "Adorei sua curiosidade! {emoji}",
-            "Vamos explorar juntos! {emoji}",
-            "Que aventura interessante! {emoji}"
-        ]
+        # Emojis sorteados antecipadamente por categoria (consumidos do fim)
+        self._emoji_buffers: Dict[str, List[str]] = {}
     
     def get_emoji(self, category: str) -> str:
         """Obter emoji aleatório de uma categoria"""
-        return random.choice(self.emojis.get(category, ['✨']))
+        buffer = self._emoji_buffers.get(category)
+        if not buffer:
+            pool = self.emojis.get(category, _DEFAULT_EMOJIS)
+            buffer = self._emoji_buffers[category] = _RNG.choices(pool, k=_EMOJI_BUFFER_SIZE)
+        return buffer.pop()
+    
+    def get_emoji_pool(self, category: str) -> tuple:
+        """Obter todos os emojis de uma categoria (para sorteio pelo chamador)"""
+        return self.emojis.get(category, _DEFAULT_EMOJIS)
     
     def get_response(self, response_type: str, custom_message: str = None) -> str:
         """Obter resposta personalizada"""
-        if response_type in self.responses:
-            template = random.choice(self.responses[response_type])
-            emoji = self.get_emoji(response_type.split('_')[0])  # Primeira palavra como categoria
-            return template.format(emoji=emoji)
+        builder = _RESPONSE_BUILDERS.get(response_type)
+        if builder is not None:
+            return builder(self)
         elif custom_message:
             emoji = self.get_emoji('info')
             return f"{custom_message} {emoji}"
@@ -122,34 +241,27 @@ class MamutePersonality:
     
     def get_greeting(self) -> str:
         """Obter saudação personalizada"""
-        greeting = random.choice(self.greetings)
-        emoji = self.get_emoji('greeting')
-        return greeting.format(emoji=emoji)
+        pre, post = _pick(_GREETINGS_SPLIT)
+        return f"{pre}{self.get_emoji('greeting')}{post}"
     
     def get_encouragement(self) -> str:
         """Obter encorajamento"""
-        encouragement = random.choice(self.encouragements)
-        emoji = self.get_emoji('love')
-        return encouragement.format(emoji=emoji)
+        pre, post = _pick(_ENCOURAGEMENTS_SPLIT)
+        return f"{pre}{self.get_emoji('love')}{post}"
     
     def get_motivational(self) -> str:
         """Obter frase motivacional"""
-        motivational = random.choice(self.motivational)
-        emoji = self.get_emoji('celebration')
-        return motivational.format(emoji=emoji)
+        pre, post = _pick(_MOTIVATIONAL_SPLIT)
+        return f"{pre}{self.get_emoji('celebration')}{post}"
     
     def format_success_response(self, content: str, results_count: int = 0) -> str:
         """Formatar resposta de sucesso"""
         success_msg = self.get_response('found')
-        emoji = self.get_emoji('success')
-        
-        response = f"{success_msg}\n\n{content}"
         
         if results_count > 0:
             data_emoji = self.get_emoji('data')
-            response += f"\n\n{data_emoji} **Resultados:** {results_count} encontrados"
-        
-        return response
+            return f"{success_msg}\n\n{content}\n\n{data_emoji} **Resultados:** {results_count} encontrados"
+        return f"{success_msg}\n\n{content}"
     
     def format_analysis_response(self, content: str) -> str:
         """Formatar resposta de análise"""
@@ -159,93 +271,55 @@ class MamutePersonality:
     def format_error_response(self, error_msg: str, suggestion: str = None) -> str:
         """Formatar resposta de erro"""
         error_response = self.get_response('error')
-        response = f"{error_response}\n\n**Erro:** {error_msg}"
         
         if suggestion:
             help_emoji = self.get_emoji('help')
-            response += f"\n\n{help_emoji} **Sugestão:** {suggestion}"
-        
-        return response
+            return f"{error_response}\n\n**Erro:** {error_msg}\n\n{help_emoji} **Sugestão:** {suggestion}"
+        return f"{error_response}\n\n**Erro:** {error_msg}"
     
     def format_help_response(self) -> str:
         """Formatar resposta de ajuda completa"""
-        help_emoji = self.get_emoji('help')
-        info_emoji = self.get_emoji('info')
-        celebration_emoji = self.get_emoji('celebration')
-        
-        help_text = f"Claro! Estou aqui para ajudar! {help_emoji}\n\n" + \
-                   f"{info_emoji} **Comandos Disponíveis:**\n\n" + \
-                   "📋 **Consultas Gerais:**\n" + \
-                   "• 'buscar [termo]' - Procurar documentos\n" + \
-                   "• 'o que você sabe sobre [assunto]?' - Fazer perguntas\n" + \
-                   "• 'quantos documentos temos?' - Ver estatísticas\n" + \
-                   "• 'me explique [tópico]' - Explicações detalhadas\n\n" + \
-                   "📊 **Análises:**\n" + \
-                   "• 'analisar [dados]' - Análise detalhada\n" + \
-                   "• 'criar gráfico de [dados]' - Gerar visualizações\n" + \
-                   "• 'resumir [tópico]' - Resumos inteligentes\n" + \
-                   "• 'comparar [item1] com [item2]' - Comparações\n\n" + \
-                   "🎯 **Dicas Especiais:**\n" + \
-                   "• Seja específico nas perguntas\n" + \
-                   "• Use linguagem natural (como está fazendo!)\n" + \
-                   "• Peça exemplos se precisar\n" + \
-                   "• Fale comigo como se fosse um amigo\n\n" + \
-                   f"Pode testar qualquer comando! Adoro conversar! {celebration_emoji}"
-        
-        return help_text
+        return _pick(_HELP_VARIANTS)
     
     def format_stats_response(self, stats: Dict[str, Any]) -> str:
         """Formatar resposta de estatísticas"""
-        stats_emoji = self.get_emoji('data')
-        time_emoji = self.get_emoji('time')
-        celebration_emoji = self.get_emoji('celebration')
-        
-        stats_text = f"Aqui estão as estatísticas! {stats_emoji}\n\n" + \
-                    f"📊 **Dados da Base:**\n"
+        parts = [f"Aqui estão as estatísticas! {self.get_emoji('data')}\n\n📊 **Dados da Base:**\n"]
         
         if 'documents' in stats:
-            stats_text += f"• Documentos: {stats['documents']:,}\n"
+            parts.append(f"• Documentos: {stats['documents']:,}\n")
         if 'queries_today' in stats:
-            stats_text += f"• Consultas hoje: {stats['queries_today']:,}\n"
+            parts.append(f"• Consultas hoje: {stats['queries_today']:,}\n")
         if 'successful_queries' in stats:
-            stats_text += f"• Consultas bem-sucedidas: {stats['successful_queries']:,}\n"
+            parts.append(f"• Consultas bem-sucedidas: {stats['successful_queries']:,}\n")
         
-        stats_text += f"\n{time_emoji} **Sessão Atual:**\n"
+        # Seção da sessão (e seu emoji) só quando há dados dela
+        if any(key in stats for key in _SESSION_STATS_KEYS):
+            parts.append(f"\n{self.get_emoji('time')} **Sessão Atual:**\n")
         
         if 'session_queries' in stats:
-            stats_text += f"• Consultas na sessão: {stats['session_queries']}\n"
+            parts.append(f"• Consultas na sessão: {stats['session_queries']}\n")
         if 'session_time' in stats:
-            stats_text += f"• Tempo de conversa: {stats['session_time']}\n"
+            parts.append(f"• Tempo de conversa: {stats['session_time']}\n")
         if 'start_time' in stats:
-            stats_text += f"• Iniciada em: {stats['start_time']}\n"
+            parts.append(f"• Iniciada em: {stats['start_time']}\n")
         
-        stats_text += f"\n{celebration_emoji} **Resultado:** Sistema funcionando perfeitamente!"
+        parts.append(f"\n{self.get_emoji('celebration')} **Resultado:** Sistema funcionando perfeitamente!")
         
-        return stats_text
+        return "".join(parts)
     
     def add_personality_touch(self, response: str) -> str:
         """Adicionar toque de personalidade a qualquer resposta"""
         # Adicionar encorajamento ocasional
-        if random.random() < 0.2:  # 20% de chance
+        if _getrandbits(16) < _ENCOURAGEMENT_THRESHOLD:  # 20% de chance
             encouragement = self.get_encouragement()
             response = f"{encouragement}\n\n{response}"
         
         # Adicionar emoji final se não houver
-        if not any(emoji in response for emoji_list in self.emojis.values() for emoji in emoji_list):
+        if _EMOJI_FIRST_CPS.isdisjoint(map(ord, response)) or not _EMOJI_RE.search(response):
             response += f" {self.get_emoji('info')}"
         
         return response
     
     def get_conversation_starter(self) -> str:
         """Obter iniciador de conversa"""
-        starters = [
-            "Que tal explorarmos alguns dados juntos? {emoji}",
-            "Tenho curiosidade sobre o que você quer descobrir! {emoji}",
-            "Pronto para alguma descoberta interessante? {emoji}",
-            "Que pergunta legal podemos investigar? {emoji}",
-            "Vamos fazer alguma análise interessante? {emoji}"
-        ]
-        
-        starter = random.choice(starters)
-        emoji = self.get_emoji('thinking')
-        return starter.format(emoji=emoji)
\ No newline at end of file
+        return _pick(_CONVERSATION_STARTER_VARIANTS)
\ No newline at end of file
@@ -5,12 +5,32 @@ IA que propõe E aplica melhorias automaticamente
 """
 
 import asyncio
+import hashlib
+import importlib.util
 import json
 import os
+import re
 import subprocess
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+import time
+from array import array
+from collections import Counter, OrderedDict, deque
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from functools import cached_property, lru_cache
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple, Mapping
 from pathlib import Path
+from types import MappingProxyType
+
+import numpy as np
+
+# orjson acelera a serialização (chaves de memoização, base de linguagens); json como fallback
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
 
 from src.database.connection import DatabaseManager
 from src.utils.config import Config
@@ -18,6 +38,415 @@ from src.utils.logger import setup_logger
 from src.ai.agent import AIAgent
 from mamute_personality import MamutePersonality
 
+# Sistema de backup é opcional: sem ele a ação de backup apenas reporta indisponibilidade
+try:
+    from backup_system import MamuteBackupSystem
+    BACKUP_AVAILABLE = True
+except ImportError:
+    BACKUP_AVAILABLE = False
+    MamuteBackupSystem = None
+
+# Palavras-chave de trechos de código por linguagem, em ordem de prioridade; uma
+# palavra-chave compartilhada conta para a primeira linguagem que a declara
+_SNIPPET_KEYWORDS = (
+    ('pascal', ('program ', 'begin', 'end.', 'var ', 'procedure ', 'function ')),
+    ('python', ('def ', 'import ', 'from ', '__init__', 'elif')),
+    ('javascript', ('function', 'const ', 'let ', 'var ', '=>', 'console.log')),
+    ('java', ('public class', 'private ', 'public static void main')),
+    ('csharp', ('using system', 'namespace ', 'public class')),
+    ('cpp', ('#include', 'std::', 'cout', 'cin', 'namespace std')),
+    ('c', ('#include', 'printf', 'scanf', 'main(')),
+    ('sql', ('select ', 'from ', 'where ', 'insert ', 'update ', 'delete ')),
+)
+_SNIPPET_PRIORITY = {lang: rank for rank, (lang, _) in enumerate(_SNIPPET_KEYWORDS)}
+_SNIPPET_KEYWORD_LANG: Dict[str, str] = {}
+for _lang, _keywords in _SNIPPET_KEYWORDS:
+    for _keyword in _keywords:
+        _SNIPPET_KEYWORD_LANG.setdefault(_keyword, _lang)
+del _lang, _keywords, _keyword
+# Uma única alternância (mais longas primeiro) varre o trecho uma vez só
+def _snippet_keyword_re(languages) -> re.Pattern:
+    """Alternância das palavras-chave creditadas às linguagens dadas (mais longas primeiro)"""
+    keywords = [kw for kw, lang in _SNIPPET_KEYWORD_LANG.items() if lang in languages]
+    return re.compile('|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))))
+
+
+_SNIPPET_KEYWORD_RE = _snippet_keyword_re(_SNIPPET_PRIORITY)
+# Inícios de trecho que já decidem as linguagens candidatas, indexados pelo primeiro
+# caractere; com uma só candidata o regex nem roda
+_SNIPPET_PREFIX_HINTS = (
+    ('#include', ('cpp', 'c')),
+    ('using system', ('csharp',)),
+    ('program ', ('pascal',)),
+    ('def ', ('python',)),
+    ('select ', ('sql',)),
+    ('insert ', ('sql',)),
+)
+_SNIPPET_HINTS_BY_CHAR: Dict[str, List[Tuple[str, Tuple[str, ...]]]] = {}
+for _prefix, _candidates in _SNIPPET_PREFIX_HINTS:
+    _SNIPPET_HINTS_BY_CHAR.setdefault(_prefix[0], []).append((_prefix, _candidates))
+del _prefix, _candidates
+_SNIPPET_CANDIDATE_RE = {
+    candidates: _snippet_keyword_re(candidates)
+    for _, candidates in _SNIPPET_PREFIX_HINTS if len(candidates) > 1
+}
+
+# Melhorias sugeridas por palavras-chave: (termos, melhoria), na ordem de avaliação
+_KEYWORD_IMPROVEMENTS = (
+    # Solicitações de otimização
+    (('lento', 'otimizar', 'melhorar performance', 'demora'), {
+        'type': 'optimization',
+        'action': 'otimizar_consultas',
+        'description': 'Otimizar consultas do banco de dados',
+        'confidence': 0.9,
+        'impact': 'alto',
+        'safe': True
+    }),
+    # Problemas de espaço/limpeza
+    (('espaço', 'limpar', 'logs', 'disco cheio'), {
+        'type': 'maintenance',
+        'action': 'limpar_logs',
+        'description': 'Limpar logs antigos para liberar espaço',
+        'confidence': 0.95,
+        'impact': 'médio',
+        'safe': True
+    }),
+    # Solicitações de backup
+    (('backup', 'salvar', 'proteger dados'), {
+        'type': 'backup',
+        'action': 'backup_automatico',
+        'description': 'Criar backup automático dos dados',
+        'confidence': 0.85,
+        'impact': 'crítico',
+        'safe': False  # Requer confirmação
+    }),
+    # Problemas de dependências
+    (('erro', 'módulo não encontrado', 'importerror', 'pascal', 'compilar'), {
+        'type': 'dependency',
+        'action': 'instalar_dependencia',
+        'description': 'Instalar dependências ou ferramentas necessárias',
+        'confidence': 0.8,
+        'impact': 'alto',
+        'safe': True
+    }),
+)
+
+# Melhorias específicas por linguagem mencionada, no mesmo formato
+_LANGUAGE_KEYWORD_IMPROVEMENTS = {
+    'pascal': (
+        (('compilar', 'compilation', 'erro de compilação'), {
+            'type': 'compilation',
+            'action': 'configurar_pascal',
+            'description': 'Configurar ambiente Pascal/Free Pascal',
+            'confidence': 0.9,
+            'impact': 'alto',
+            'safe': True,
+            'language': 'pascal'
+        }),
+        (('modernizar', 'atualizar', 'migrar'), {
+            'type': 'modernization',
+            'action': 'modernizar_pascal',
+            'description': 'Modernizar código Pascal para Object Pascal',
+            'confidence': 0.8,
+            'impact': 'alto',
+            'safe': False,
+            'language': 'pascal'
+        }),
+    ),
+    'python': (
+        (('dependências', 'pip', 'install'), {
+            'type': 'dependency',
+            'action': 'configurar_python_env',
+            'description': 'Configurar ambiente virtual Python',
+            'confidence': 0.95,
+            'impact': 'médio',
+            'safe': True,
+            'language': 'python'
+        }),
+    ),
+    'javascript': (
+        (('npm', 'dependencies', 'node_modules'), {
+            'type': 'dependency',
+            'action': 'limpar_node_modules',
+            'description': 'Limpar e reinstalar node_modules',
+            'confidence': 0.85,
+            'impact': 'médio',
+            'safe': True,
+            'language': 'javascript'
+        }),
+    ),
+}
+
+
+def _build_improvement_terms() -> Tuple[Dict[str, frozenset], re.Pattern]:
+    """Índice termo -> regras (None ou linguagem, posição) e regex que acha todos os termos"""
+    rules: Dict[str, set] = {}
+    for index, (terms, _) in enumerate(_KEYWORD_IMPROVEMENTS):
+        for term in terms:
+            rules.setdefault(term, set()).add((None, index))
+    for lang, entries in _LANGUAGE_KEYWORD_IMPROVEMENTS.items():
+        for index, (terms, _) in enumerate(entries):
+            for term in terms:
+                rules.setdefault(term, set()).add((lang, index))
+    
+    # A alternância devolve o termo mais longo em cada posição; os termos contidos nele
+    # (ex.: 'erro' em 'erro de compilação') disparam junto
+    index = {
+        term: frozenset().union(*(ids for other, ids in rules.items() if other in term))
+        for term in rules
+    }
+    # Lookahead: testa todas as posições, inclusive termos sobrepostos
+    names = sorted(map(re.escape, rules), key=len, reverse=True)
+    return index, re.compile('(?=(' + '|'.join(names) + '))')
+
+
+_TERM_RULES, _IMPROVEMENT_TERMS_RE = _build_improvement_terms()
+
+
+@lru_cache(maxsize=512)
+def _matched_improvement_rules(text_lower: str) -> frozenset:
+    """Regras de melhoria disparadas pelo texto (já em minúsculas), numa única passada"""
+    matched = set()
+    for term in set(_IMPROVEMENT_TERMS_RE.findall(text_lower)):
+        matched |= _TERM_RULES[term]
+    return frozenset(matched)
+
+# Tipos de consulta por termos, em ordem de prioridade
+_QUERY_TYPE_RULES = (
+    ('improvement_request', ('melhorar', 'otimizar', 'acelerar', 'corrigir')),
+    ('greeting', ('oi', 'olá', 'hello')),
+    ('help', ('ajuda', 'help')),
+)
+_QUERY_TYPE_BY_TERM = {term: query_type for query_type, terms in _QUERY_TYPE_RULES for term in terms}
+# Lookahead: todos os termos, inclusive sobrepostos, numa única passada
+_QUERY_TYPE_TERMS_RE = re.compile(
+    '(?=(' + '|'.join(sorted(map(re.escape, _QUERY_TYPE_BY_TERM), key=len, reverse=True)) + '))'
+)
+
+# Tipos de consulta que não disparam análise proativa quando não citam nenhum gatilho
+_NO_ANALYSIS_QUERY_TYPES = frozenset({'greeting', 'help'})
+
+# Ações disponíveis: nome da ação -> método que a executa
+_ACTION_METHODS = {
+    'otimizar_consultas': 'optimize_database_queries',
+    'limpar_logs': 'clean_old_logs',
+    'backup_automatico': 'create_automatic_backup',
+    'atualizar_indices': 'update_database_indexes',
+    'gerar_relatorio': 'generate_performance_report',
+    'otimizar_memoria': 'optimize_memory_usage',
+    'verificar_integridade': 'check_data_integrity',
+    'instalar_dependencia': 'install_missing_dependency',
+    'corrigir_configuracao': 'fix_configuration_issue',
+    'atualizar_sistema': 'update_system_components',
+}
+
+# Preferência do usuário que libera cada tipo de melhoria: tipo -> (preferência, valor exigido)
+_TYPE_PREFERENCE_GATES = {
+    'optimization': ('auto_apply_optimizations', True),
+    'maintenance': ('auto_apply_maintenance', True),
+    'system': ('ask_before_system_changes', False),
+}
+
+# Ações que podem rodar em paralelo com as demais; as que mexem no banco inteiro
+# (ANALYZE/REINDEX, backup) ou alteram o sistema rodam uma de cada vez
+_CONCURRENCY_SAFE_ACTIONS = frozenset({
+    'limpar_logs', 'gerar_relatorio', 'otimizar_memoria',
+    'verificar_integridade', 'instalar_dependencia',
+})
+
+# Logs modificados há mais dias que isso são removidos pela limpeza automática
+_LOG_RETENTION_DAYS = 30
+# Threads usadas para stat/unlink na limpeza de logs
+_LOG_CLEAN_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+# Dependências opcionais verificadas pela IA proativa (revalidadas a cada _DEPS_CHECK_TTL s)
+_REQUIRED_DEPS = ('psutil', 'schedule', 'matplotlib', 'seaborn')
+_DEPS_CHECK_TTL = 60
+
+
+@lru_cache(maxsize=1)
+def _missing_dependencies(time_bucket: int) -> Tuple[str, ...]:
+    """Dependências ausentes; find_spec localiza o módulo sem executá-lo"""
+    return tuple(dep for dep in _REQUIRED_DEPS if importlib.util.find_spec(dep) is None)
+
+
+# Máximo de registros mantidos nos históricos de melhorias da sessão
+_IMPROVEMENT_HISTORY_SIZE = 10_000
+
+# Registros internos guardam instantes em nanossegundos; o ISO só é gerado na exportação
+_now_ns = time.time_ns
+
+# Memoização de analyze_and_improve: resposta padrão e melhorias vindas da entrada reaproveitadas
+# por até _MEMO_TTL segundos (a saúde do sistema é sempre reavaliada com o próprio TTL)
+_MEMO_SIZE = 1000
+_MEMO_TTL = 300.0
+# Consultas parafraseadas com similaridade de cosseno >= limiar reaproveitam a entrada memoizada
+_MEMO_SIMILARITY = 0.85
+
+# Conhecimento completo sobre linguagens de programação, mantido em data/languages.json
+_LANGUAGES_FILE = Path(__file__).resolve().parent / 'data' / 'languages.json'
+
+
+@lru_cache(maxsize=None)
+def load_programming_languages() -> Dict[str, Dict[str, Any]]:
+    """Carregar o conhecimento sobre linguagens (uma vez por processo, no primeiro uso)"""
+    raw = _LANGUAGES_FILE.read_bytes()
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+@dataclass(frozen=True, slots=True)
+class LangInfo:
+    """Campos de uma linguagem usados nos conselhos; os demais ficam em extra"""
+    description: str
+    extensions: Tuple[str, ...] = ()
+    common_issues: Tuple[str, ...] = ()
+    tools: Tuple[str, ...] = ()
+    optimizations: Tuple[str, ...] = ()
+    best_practices: Tuple[str, ...] = ()
+    modern_variants: Tuple[str, ...] = ()
+    extra: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    
+    @classmethod
+    def from_dict(cls, info: Dict[str, Any]) -> 'LangInfo':
+        """Construir a partir de uma entrada de data/languages.json"""
+        known = {name: info[name] for name in cls.__dataclass_fields__ if name in info and name != 'extra'}
+        for name, value in known.items():
+            if isinstance(value, list):
+                known[name] = tuple(value)
+        extra = {name: value for name, value in info.items() if name not in known}
+        return cls(**known, extra=MappingProxyType(extra))
+
+
+@lru_cache(maxsize=None)
+def load_language_infos() -> Mapping[str, LangInfo]:
+    """Linguagens como LangInfo imutáveis (mesma ordem de data/languages.json)"""
+    return MappingProxyType({
+        lang: LangInfo.from_dict(info) for lang, info in load_programming_languages().items()
+    })
+
+
+# Recomendações de projeto por linguagem detectada
+_LANGUAGE_RECOMMENDATIONS = {
+    'pascal': (
+        "📚 Pascal detectado - considere migração para Object Pascal ou Free Pascal",
+        "🔧 Use Lazarus IDE para desenvolvimento visual multiplataforma",
+    ),
+    'python': (
+        "🐍 Configure virtual environment para isolamento de dependências",
+        "✅ Implemente testes com pytest e type hints com mypy",
+    ),
+    'javascript': (
+        "📦 Use npm/yarn para gestão de dependências",
+        "🔧 Configure ESLint e Prettier para qualidade de código",
+    ),
+}
+
+# Conselhos adicionais para Pascal (linguagem com suporte dedicado)
+_PASCAL_ADVICE_EXTRAS = {
+    "learning_resources": (
+        "Free Pascal Documentation",
+        "Lazarus IDE Tutorials",
+        "Object Pascal Handbook",
+    ),
+    "migration_paths": (
+        "Para projetos modernos: considere Delphi ou Free Pascal",
+        "Para web: pas2js para transpilação para JavaScript",
+        "Para mobile: Delphi com FireMonkey framework",
+    ),
+    "specific_tips": (
+        "Use units para organizar código modular",
+        "Implemente proper error handling com try/except",
+        "Considere Object Pascal para programação OO",
+        "Utilize records para estruturas de dados",
+        "Implemente interfaces para design patterns modernos",
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def _language_advice() -> Mapping[str, Mapping[str, Any]]:
+    """Conselhos por linguagem, montados uma única vez e compartilhados somente leitura"""
+    table = {}
+    for lang, info in load_language_infos().items():
+        advice = {
+            "language": lang,
+            "description": info.description,
+            "common_issues": info.common_issues,
+            "recommended_tools": info.tools,
+            "optimization_tips": info.optimizations,
+            "best_practices": info.best_practices,
+        }
+        if lang == 'pascal':
+            advice["modern_alternatives"] = info.modern_variants
+            advice.update(_PASCAL_ADVICE_EXTRAS)
+        table[lang] = MappingProxyType(advice)
+    return MappingProxyType(table)
+
+
+@lru_cache(maxsize=None)
+def _ext_to_lang() -> Dict[str, str]:
+    """Índice extensão -> linguagem; em caso de conflito (ex.: .h) vale a primeira declarada"""
+    index = {}
+    for lang, info in load_programming_languages().items():
+        for ext in info.get('extensions', ()):
+            index.setdefault(ext.lower(), lang)
+    return index
+
+
+@lru_cache(maxsize=4096)
+def _language_for_path(file_path: str) -> Optional[str]:
+    """Linguagem pela extensão do arquivo (memoizado para varreduras repetidas)"""
+    return _ext_to_lang().get(Path(file_path).suffix.lower())
+
+
+# Diretórios ignorados na varredura de projetos (além dos ocultos)
+_SCAN_SKIP_DIRS = frozenset({'node_modules', '__pycache__', 'target', 'build'})
+_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _scan_dir(path: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """Listar um diretório: ((caminho, extensão) dos arquivos visíveis, subdiretórios a visitar)"""
+    files, subdirs = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                if name.startswith('.'):
+                    continue
+                # DirEntry já traz o tipo na maioria dos sistemas: sem stat extra
+                if entry.is_dir():
+                    if name not in _SCAN_SKIP_DIRS and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    # Extensão direto do nome, sem montar Path nem refazer o caminho
+                    dot = name.rfind('.')
+                    files.append((entry.path, name[dot:].lower() if dot > 0 else ''))
+    except OSError:
+        pass
+    return files, subdirs
+
+
+@lru_cache(maxsize=None)
+def _lang_name_re() -> re.Pattern:
+    """Nomes de linguagens como palavras inteiras, numa única passada sobre o texto"""
+    names = sorted(map(re.escape, load_programming_languages()), key=len, reverse=True)
+    return re.compile(r'\b(' + '|'.join(names) + r')\b')
+
+
+@lru_cache(maxsize=512)
+def _detect_langs_in_text(text_lower: str) -> tuple:
+    """Linguagens mencionadas no texto (já em minúsculas), na ordem de data/languages.json"""
+    found = set(_lang_name_re().findall(text_lower))
+    return tuple(lang for lang in load_programming_languages() if lang in found)
+
+
+def reload_programming_languages():
+    """Recarregar data/languages.json e descartar os índices derivados"""
+    for cached in (load_programming_languages, load_language_infos, _language_advice, _ext_to_lang,
+                   _language_for_path, _lang_name_re, _detect_langs_in_text):
+        cached.cache_clear()
+
+
 class MamuteProactiveIA:
     """IA Proativa que propõe e aplica melhorias automaticamente"""
     
@@ -31,374 +460,80 @@ class MamuteProactiveIA:
         self.ai_agent = AIAgent(self.config, self.db_manager)
         self.personality = MamutePersonality()
         
-        # Sistema de ações disponíveis
-        self.available_actions = {
-            'otimizar_consultas': self.optimize_database_queries,
-            'limpar_logs': self.clean_old_logs,
-            'backup_automatico': self.create_automatic_backup,
-            'atualizar_indices': self.update_database_indexes,
-            'gerar_relatorio': self.generate_performance_report,
-            'otimizar_memoria': self.optimize_memory_usage,
-            'verificar_integridade': self.check_data_integrity,
-            'instalar_dependencia': self.install_missing_dependency,
-            'corrigir_configuracao': self.fix_configuration_issue,
-            'atualizar_sistema': self.update_system_components
-        }
+        # Sistema de ações disponíveis (somente leitura)
+        self.available_actions = MappingProxyType(
+            {action: getattr(self, method) for action, method in _ACTION_METHODS.items()}
+        )
         
         # Configurações de automação
         self.auto_apply_threshold = 0.8  # Confiança mínima para aplicar automaticamente
         self.require_confirmation = ['backup_automatico', 'atualizar_sistema']  # Ações que sempre pedem confirmação
         
         # Estado da sessão
-        self.session_improvements = []
-        self.applied_improvements = []
+        # Históricos limitados: em sessões longas os registros mais antigos são descartados
+        self.session_improvements = deque(maxlen=_IMPROVEMENT_HISTORY_SIZE)
+        self.applied_improvements = deque(maxlen=_IMPROVEMENT_HISTORY_SIZE)
+        self.total_applied = 0
         self.user_preferences = {
             'auto_apply_safe_improvements': True,
             'auto_apply_optimizations': True,
             'auto_apply_maintenance': True,
-            'ask_before_system_changes': True
+            'ask_before_system_changes': True,
+            'health_check_ttl': 30.0  # Segundos entre análises completas da saúde do sistema
         }
+        # Última análise de saúde: (instante monotônico, melhorias sugeridas)
+        self._health_cache: Tuple[float, List[Dict]] = (float('-inf'), [])
         
-        # Conhecimento completo sobre linguagens de programação
-        self.programming_languages = {
-            'pascal': {
-                'extensions': ['.pas', '.pp', '.p', '.dpr', '.dpk', '.inc'],
-                'compilers': ['Free Pascal (FPC)', 'Delphi', 'Turbo Pascal', 'GNU Pascal'],
-                'common_issues': ['memory_management', 'pointer_errors', 'compilation_errors', 'unit_dependencies'],
-                'tools': ['fpc', 'delphi', 'lazarus', 'gdb', 'pas2js'],
-                'optimizations': ['compiler_optimization', 'memory_allocation', 'string_handling', 'recursion_optimization'],
-                'best_practices': ['structured_programming', 'unit_organization', 'error_handling', 'documentation'],
-                'description': 'Linguagem estruturada criada por Niklaus Wirth, focada na clareza e ensino de programação',
-                'paradigms': ['procedural', 'structured'],
-                'typical_domains': ['educação', 'sistemas embarcados', 'aplicações desktop', 'compiladores'],
-                'modern_variants': ['Object Pascal', 'Delphi', 'Free Pascal']
-            },
-            'python': {
-                'extensions': ['.py', '.pyw', '.pyi', '.ipynb'],
-                'interpreters': ['CPython', 'PyPy', 'Jython', 'IronPython', 'MicroPython'],
-                'common_issues': ['imports', 'indentation', 'dependencies', 'performance', 'gil_limitations'],
-                'tools': ['pip', 'pytest', 'black', 'flake8', 'mypy', 'poetry', 'conda', 'virtualenv'],
-                'optimizations': ['vectorization', 'caching', 'async/await', 'multiprocessing', 'cython'],
-                'best_practices': ['pep8', 'type_hints', 'virtual_environments', 'testing', 'documentation'],
-                'description': 'Linguagem interpretada, orientada a objetos, de alto nível com sintaxe clara',
-                'paradigms': ['object-oriented', 'procedural', 'functional'],
-                'typical_domains': ['web development', 'data science', 'AI/ML', 'automation', 'scripting'],
-                'frameworks': ['Django', 'Flask', 'FastAPI', 'Pandas', 'NumPy', 'TensorFlow', 'PyTorch']
-            },
-            'javascript': {
-                'extensions': ['.js', '.jsx', '.mjs', '.cjs'],
-                'engines': ['V8', 'SpiderMonkey', 'JavaScriptCore', 'Chakra'],
-                'common_issues': ['callback_hell', 'hoisting', 'scope_issues', 'async_errors', 'memory_leaks'],
-                'tools': ['npm', 'yarn', 'webpack', 'eslint', 'jest', 'babel', 'prettier'],
-                'optimizations': ['minification', 'tree-shaking', 'code-splitting', 'lazy-loading', 'service_workers'],
-                'best_practices': ['es6+', 'modules', 'testing', 'linting', 'documentation'],
-                'description': 'Linguagem interpretada, dinâmica, para web frontend e backend',
-                'paradigms': ['object-oriented', 'functional', 'event-driven'],
-                'typical_domains': ['web frontend', 'web backend', 'mobile apps', 'desktop apps'],
-                'frameworks': ['React', 'Vue', 'Angular', 'Node.js', 'Express', 'Next.js']
-            },
-            'typescript': {
-                'extensions': ['.ts', '.tsx', '.d.ts'],
-                'compilers': ['tsc', 'esbuild', 'swc', 'babel'],
-                'common_issues': ['type_errors', 'compilation_config', 'js_interop', 'strict_mode'],
-                'tools': ['tsc', 'ts-node', 'eslint', 'prettier', 'jest'],
-                'optimizations': ['strict_mode', 'tree-shaking', 'type_inference', 'incremental_compilation'],
-                'description': 'Superset tipado do JavaScript com compilação para JS',
-                'paradigms': ['object-oriented', 'functional', 'generic_programming'],
-                'frameworks': ['Angular', 'React', 'Vue', 'NestJS']
-            },
-            'java': {
-                'extensions': ['.java', '.class', '.jar', '.war'],
-                'jvms': ['Oracle JVM', 'OpenJDK', 'GraalVM', 'Eclipse OpenJ9'],
-                'common_issues': ['memory_leaks', 'gc_performance', 'dependency_hell', 'thread_safety'],
-                'tools': ['maven', 'gradle', 'junit', 'checkstyle', 'spotbugs', 'jacoco'],
-                'optimizations': ['jvm_tuning', 'garbage_collection', 'profiling', 'caching'],
-                'description': 'Linguagem orientada a objetos, compilada para bytecode JVM',
-                'paradigms': ['object-oriented', 'generic_programming'],
-                'frameworks': ['Spring', 'Hibernate', 'Apache Struts', 'JSF']
-            },
-            'csharp': {
-                'extensions': ['.cs', '.dll', '.exe'],
-                'runtimes': ['.NET Framework', '.NET Core', '.NET 5+', 'Mono'],
-                'common_issues': ['null_references', 'memory_management', 'async_deadlocks'],
-                'tools': ['dotnet', 'nuget', 'mstest', 'nunit', 'xunit', 'roslyn'],
-                'optimizations': ['async_patterns', 'span_memory', 'linq_performance', 'gc_optimization'],
-                'description': 'Linguagem orientada a objetos da Microsoft para .NET',
-                'frameworks': ['ASP.NET', 'Entity Framework', 'WPF', 'Xamarin', 'Unity']
-            },
-            'cpp': {
-                'extensions': ['.cpp', '.cc', '.cxx', '.c++', '.hpp', '.h', '.hxx'],
-                'compilers': ['GCC', 'Clang', 'MSVC', 'ICC'],
-                'common_issues': ['memory_leaks', 'segfaults', 'undefined_behavior', 'abi_compatibility'],
-                'tools': ['cmake', 'make', 'gdb', 'valgrind', 'clang-tidy', 'cppcheck'],
-                'optimizations': ['raii', 'move_semantics', 'template_metaprogramming', 'vectorization'],
-                'description': 'Linguagem compilada, orientada a objetos, de sistemas',
-                'paradigms': ['object-oriented', 'generic_programming', 'procedural'],
-                'standards': ['C++11', 'C++14', 'C++17', 'C++20', 'C++23']
-            },
-            'c': {
-                'extensions': ['.c', '.h'],
-                'compilers': ['GCC', 'Clang', 'MSVC', 'TCC'],
-                'common_issues': ['buffer_overflows', 'memory_leaks', 'pointer_errors', 'undefined_behavior'],
-                'tools': ['make', 'cmake', 'gdb', 'valgrind', 'static_analyzers'],
-                'optimizations': ['compiler_flags', 'algorithm_optimization', 'cache_efficiency'],
-                'description': 'Linguagem procedural compilada, base de muitos sistemas',
-                'paradigms': ['procedural', 'structured'],
-                'standards': ['C89', 'C99', 'C11', 'C17', 'C23']
-            },
-            'go': {
-                'extensions': ['.go'],
-                'compiler': 'gc (official Go compiler)',
-                'common_issues': ['goroutine_leaks', 'race_conditions', 'gc_pressure'],
-                'tools': ['go_mod', 'go_test', 'go_fmt', 'go_vet', 'golint', 'delve'],
-                'optimizations': ['goroutines', 'channels', 'memory_pooling', 'profiling'],
-                'description': 'Linguagem compilada, concorrente, criada pelo Google',
-                'paradigms': ['concurrent', 'procedural', 'object-oriented (interfaces)']
-            },
-            'rust': {
-                'extensions': ['.rs'],
-                'compiler': 'rustc',
-                'common_issues': ['borrow_checker', 'lifetime_issues', 'async_complexity'],
-                'tools': ['cargo', 'rustc', 'clippy', 'rustfmt', 'miri'],
-                'optimizations': ['zero_cost_abstractions', 'ownership', 'traits'],
-                'description': 'Linguagem de sistemas com memory safety sem garbage collector',
-                'paradigms': ['systems', 'functional', 'concurrent']
-            },
-            'php': {
-                'extensions': ['.php', '.phtml', '.php3', '.php4', '.php5'],
-                'interpreters': ['Zend Engine', 'HHVM', 'PHP-FPM'],
-                'common_issues': ['sql_injection', 'xss', 'memory_leaks', 'deprecated_functions'],
-                'tools': ['composer', 'phpunit', 'phpstan', 'psalm', 'php-cs-fixer'],
-                'optimizations': ['opcode_caching', 'database_optimization', 'autoloading'],
-                'description': 'Linguagem interpretada amplamente usada para desenvolvimento web',
-                'frameworks': ['Laravel', 'Symfony', 'CodeIgniter', 'CakePHP']
-            },
-            'ruby': {
-                'extensions': ['.rb', '.rbw'],
-                'interpreters': ['MRI (CRuby)', 'JRuby', 'TruffleRuby', 'mruby'],
-                'common_issues': ['performance', 'gem_conflicts', 'memory_usage'],
-                'tools': ['bundler', 'rspec', 'rubocop', 'pry', 'rails'],
-                'optimizations': ['yjit', 'memory_optimization', 'algorithm_improvement'],
-                'description': 'Linguagem interpretada, orientada a objetos, expressiva',
-                'frameworks': ['Ruby on Rails', 'Sinatra', 'Hanami']
-            },
-            'swift': {
-                'extensions': ['.swift'],
-                'compiler': 'Swift Compiler (swiftc)',
-                'common_issues': ['arc_cycles', 'compilation_time', 'optionals'],
-                'tools': ['swift_package_manager', 'xctest', 'swiftlint', 'instruments'],
-                'optimizations': ['arc_optimization', 'protocol_optimization', 'whole_module_optimization'],
-                'description': 'Linguagem compilada da Apple para iOS/macOS/watchOS/tvOS',
-                'frameworks': ['SwiftUI', 'UIKit', 'Foundation', 'Combine']
-            },
-            'kotlin': {
-                'extensions': ['.kt', '.kts'],
-                'compilers': ['kotlinc-jvm', 'kotlinc-js', 'kotlinc-native'],
-                'common_issues': ['java_interop', 'compilation_time', 'null_safety'],
-                'tools': ['gradle', 'maven', 'ktlint', 'detekt'],
-                'optimizations': ['coroutines', 'inline_functions', 'data_classes'],
-                'description': 'Linguagem moderna para JVM, interoperável com Java',
-                'frameworks': ['Spring', 'Ktor', 'Android SDK']
-            },
-            'scala': {
-                'extensions': ['.scala', '.sc'],
-                'compiler': 'scalac',
-                'common_issues': ['compilation_time', 'complexity', 'implicit_resolution'],
-                'tools': ['sbt', 'scalatest', 'scalafmt', 'scalafix'],
-                'optimizations': ['functional_programming', 'immutability', 'parallel_collections'],
-                'description': 'Linguagem funcional/OO para JVM',
-                'frameworks': ['Akka', 'Play Framework', 'Spark']
-            },
-            'sql': {
-                'extensions': ['.sql', '.ddl', '.dml'],
-                'databases': ['PostgreSQL', 'MySQL', 'SQLite', 'Oracle', 'SQL Server'],
-                'common_issues': ['slow_queries', 'injection', 'normalization', 'deadlocks'],
-                'tools': ['explain', 'analyze', 'vacuum', 'sqlcheck', 'pgbench'],
-                'optimizations': ['indexing', 'query_rewriting', 'partitioning', 'materialized_views'],
-                'description': 'Linguagem declarativa para bancos de dados relacionais',
-                'variants': ['PostgreSQL', 'MySQL', 'T-SQL', 'PL/SQL', 'SQLite']
-            },
-            'r': {
-                'extensions': ['.r', '.R', '.Rmd'],
-                'interpreter': 'R',
-                'common_issues': ['memory_usage', 'performance', 'package_conflicts'],
-                'tools': ['cran', 'devtools', 'testthat', 'lintr', 'rstudio'],
-                'optimizations': ['vectorization', 'parallel_computing', 'rcpp'],
-                'description': 'Linguagem para estatística e análise de dados',
-                'frameworks': ['tidyverse', 'shiny', 'ggplot2', 'dplyr']
-            },
-            'matlab': {
-                'extensions': ['.m', '.mlx', '.mat'],
-                'engine': 'MATLAB Engine',
-                'common_issues': ['performance', 'licensing_costs', 'memory_usage'],
-                'tools': ['simulink', 'profiler', 'mlint', 'app_designer'],
-                'optimizations': ['vectorization', 'parallel_computing', 'gpu_computing'],
-                'description': 'Linguagem para computação técnica e científica',
-                'toolboxes': ['Signal Processing', 'Image Processing', 'Deep Learning']
-            },
-            'fortran': {
-                'extensions': ['.f', '.f77', '.f90', '.f95', '.f03', '.f08'],
-                'compilers': ['gfortran', 'ifort', 'xlf', 'nagfor'],
-                'common_issues': ['legacy_code', 'modernization', 'array_bounds'],
-                'tools': ['make', 'cmake', 'funit', 'fordoc'],
-                'optimizations': ['array_operations', 'parallel_computing', 'coarrays'],
-                'description': 'Linguagem para computação científica e numérica de alta performance',
-                'standards': ['Fortran 77', 'Fortran 90', 'Fortran 95', 'Fortran 2003', 'Fortran 2008']
-            },
-            'cobol': {
-                'extensions': ['.cbl', '.cob', '.cpy', '.pco'],
-                'compilers': ['GnuCOBOL', 'IBM Enterprise COBOL', 'Micro Focus COBOL'],
-                'common_issues': ['legacy_maintenance', 'y2k_issues', 'modernization'],
-                'tools': ['gnucobol', 'enterprise_cobol', 'micro_focus'],
-                'optimizations': ['code_modernization', 'database_integration', 'web_services'],
-                'description': 'Linguagem para sistemas empresariais e transações comerciais',
-                'domains': ['banking', 'insurance', 'government', 'mainframes']
-            },
-            'assembly': {
-                'extensions': ['.asm', '.s', '.S'],
-                'assemblers': ['NASM', 'MASM', 'GAS', 'YASM'],
-                'common_issues': ['portability', 'debugging_difficulty', 'maintenance'],
-                'tools': ['nasm', 'gas', 'gdb', 'objdump', 'radare2'],
-                'optimizations': ['instruction_scheduling', 'register_allocation', 'loop_unrolling'],
-                'description': 'Linguagem de baixo nível, mnemônicos para instruções de CPU',
-                'architectures': ['x86', 'x86_64', 'ARM', 'MIPS', 'RISC-V']
-            },
-            'lua': {
-                'extensions': ['.lua'],
-                'interpreter': 'Lua',
-                'common_issues': ['performance', 'memory_usage', 'c_integration'],
-                'tools': ['luarocks', 'busted', 'luacheck', 'luacov'],
-                'optimizations': ['luajit', 'table_optimization', 'coroutines'],
-                'description': 'Linguagem leve, embarcável, para scripting e extensão',
-                'applications': ['game scripting', 'nginx', 'redis', 'wireshark']
-            },
-            'perl': {
-                'extensions': ['.pl', '.pm', '.t', '.pod'],
-                'interpreter': 'Perl 5',
-                'common_issues': ['readability', 'cpan_dependencies', 'unicode_handling'],
-                'tools': ['cpan', 'prove', 'perlcritic', 'perltidy'],
-                'optimizations': ['regex_compilation', 'hash_optimization', 'xs_modules'],
-                'description': 'Linguagem interpretada, excelente para processamento de texto',
-                'strengths': ['regex', 'text_processing', 'system_administration']
-            },
-            'haskell': {
-                'extensions': ['.hs', '.lhs'],
-                'compiler': 'GHC (Glasgow Haskell Compiler)',
-                'common_issues': ['lazy_evaluation', 'space_leaks', 'monad_complexity'],
-                'tools': ['cabal', 'stack', 'hlint', 'hspec', 'quickcheck'],
-                'optimizations': ['strictness_annotations', 'fusion', 'stream_processing'],
-                'description': 'Linguagem funcional pura com avaliação preguiçosa',
-                'concepts': ['monads', 'type_classes', 'higher_order_functions']
-            },
-            'erlang': {
-                'extensions': ['.erl', '.hrl', '.beam'],
-                'vm': 'BEAM (Erlang Virtual Machine)',
-                'common_issues': ['hot_code_loading', 'pattern_matching', 'process_communication'],
-                'tools': ['rebar3', 'eunit', 'dialyzer', 'observer'],
-                'optimizations': ['actor_model', 'fault_tolerance', 'distribution'],
-                'description': 'Linguagem funcional para sistemas concorrentes e distribuídos',
-                'features': ['lightweight_processes', 'let_it_crash', 'hot_swapping']
-            },
-            'elixir': {
-                'extensions': ['.ex', '.exs'],
-                'vm': 'BEAM (Erlang Virtual Machine)',
-                'common_issues': ['otp_patterns', 'genserver_design', 'supervision_trees'],
-                'tools': ['mix', 'exunit', 'credo', 'dialyxir', 'phoenix'],
-                'optimizations': ['otp_behaviors', 'process_pooling', 'pipeline_operator'],
-                'description': 'Linguagem funcional dinâmica para Erlang VM',
-                'frameworks': ['Phoenix', 'Nerves', 'LiveView']
-            }
-        }
+        # Memoização: chave -> (instante, {'response', 'improvements'}), com despejo LRU
+        self._response_cache: OrderedDict[str, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        self._memo_embeddings: Dict[str, np.ndarray] = {}
+        self._memo_matrix: Optional[np.ndarray] = None
+        self._memo_matrix_keys: List[str] = []
+        # Função opcional de embedding (texto -> vetor normalizado) para acertos por paráfrase
+        self.embed_fn: Optional[Callable[[str], Awaitable[Optional[np.ndarray]]]] = None
         
         self.logger.info("🚀 IA Proativa Mamute inicializada com conhecimento completo de 25+ linguagens!")
     
+    @cached_property
+    def programming_languages(self) -> Dict[str, Dict[str, Any]]:
+        """Conhecimento sobre linguagens (compartilhado, somente leitura)"""
+        return load_programming_languages()
+    
     def detect_programming_language(self, file_path: str = None, code_snippet: str = None) -> str:
         """Detectar linguagem de programação por extensão ou análise de código"""
         if file_path:
-            ext = Path(file_path).suffix.lower()
-            for lang, info in self.programming_languages.items():
-                if ext in info['extensions']:
-                    return lang
+            lang = _language_for_path(file_path)
+            if lang:
+                return lang
         
         if code_snippet:
-            # Análise básica por palavras-chave/sintaxe
+            # Análise por palavras-chave/sintaxe: vence a linguagem com mais ocorrências,
+            # com empate decidido pela ordem de prioridade
             code_lower = code_snippet.lower()
+            head = code_lower.lstrip()
+            keyword_re = _SNIPPET_KEYWORD_RE
+            for prefix, candidates in _SNIPPET_HINTS_BY_CHAR.get(head[:1], ()):
+                if head.startswith(prefix):
+                    if len(candidates) == 1:
+                        return candidates[0]
+                    keyword_re = _SNIPPET_CANDIDATE_RE[candidates]
+                    break
             
-            # Pascal
-            if any(keyword in code_lower for keyword in ['program ', 'begin', 'end.', 'var ', 'procedure ', 'function ']):
-                return 'pascal'
-            
-            # Python
-            if any(keyword in code_lower for keyword in ['def ', 'import ', 'from ', '__init__', 'elif']):
-                return 'python'
-            
-            # JavaScript/TypeScript
-            if any(keyword in code_lower for keyword in ['function', 'const ', 'let ', 'var ', '=>', 'console.log']):
-                if ': ' in code_snippet and 'interface' in code_lower:
+            hits = Counter(_SNIPPET_KEYWORD_LANG[keyword]
+                           for keyword in keyword_re.findall(code_lower))
+            if hits:
+                lang = max(hits, key=lambda l: (hits[l], -_SNIPPET_PRIORITY[l]))
+                if lang == 'javascript' and ': ' in code_snippet and 'interface' in code_lower:
                     return 'typescript'
-                return 'javascript'
-            
-            # Java
-            if any(keyword in code_lower for keyword in ['public class', 'private ', 'public static void main']):
-                return 'java'
-            
-            # C#
-            if any(keyword in code_lower for keyword in ['using system', 'namespace ', 'public class']):
-                return 'csharp'
-            
-            # C++
-            if any(keyword in code_lower for keyword in ['#include', 'std::', 'cout', 'cin', 'namespace std']):
-                return 'cpp'
-            
-            # C
-            if any(keyword in code_lower for keyword in ['#include', 'printf', 'scanf', 'main(']) and 'std::' not in code_lower:
-                return 'c'
-            
-            # SQL
-            if any(keyword in code_lower for keyword in ['select ', 'from ', 'where ', 'insert ', 'update ', 'delete ']):
-                return 'sql'
+                return lang
         
         return 'unknown'
     
-    def get_language_specific_advice(self, language: str, issue_type: str = None) -> Dict[str, Any]:
-        """Obter conselhos específicos para uma linguagem"""
-        if language not in self.programming_languages:
+    def get_language_specific_advice(self, language: str, issue_type: str = None) -> Mapping[str, Any]:
+        """Obter conselhos específicos para uma linguagem (somente leitura)"""
+        advice = _language_advice().get(language)
+        if advice is None:
             return {"error": f"Linguagem '{language}' não reconhecida"}
-        
-        lang_info = self.programming_languages[language]
-        
-        advice = {
-            "language": language,
-            "description": lang_info["description"],
-            "common_issues": lang_info.get("common_issues", []),
-            "recommended_tools": lang_info.get("tools", []),
-            "optimization_tips": lang_info.get("optimizations", []),
-            "best_practices": lang_info.get("best_practices", []),
-        }
-        
-        # Adicionar conselhos específicos para Pascal
-        if language == 'pascal':
-            advice.update({
-                "modern_alternatives": lang_info.get("modern_variants", []),
-                "learning_resources": [
-                    "Free Pascal Documentation",
-                    "Lazarus IDE Tutorials", 
-                    "Object Pascal Handbook"
-                ],
-                "migration_paths": [
-                    "Para projetos modernos: considere Delphi ou Free Pascal",
-                    "Para web: pas2js para transpilação para JavaScript",
-                    "Para mobile: Delphi com FireMonkey framework"
-                ],
-                "specific_tips": [
-                    "Use units para organizar código modular",
-                    "Implemente proper error handling com try/except",
-                    "Considere Object Pascal para programação OO",
-                    "Utilize records para estruturas de dados",
-                    "Implemente interfaces para design patterns modernos"
-                ]
-            })
-        
         return advice
     
     def scan_project_languages(self, project_path: str) -> Dict[str, Any]:
@@ -406,106 +541,230 @@ class MamuteProactiveIA:
         if not os.path.exists(project_path):
             return {"error": "Projeto não encontrado"}
         
-        language_files = {}
+        # Linguagens identificadas por índice: contagem em array e só 3 exemplos por linguagem
+        languages = list(self.programming_languages)
+        lang_ids = {lang: index for index, lang in enumerate(languages)}
+        ext_to_id = {ext: lang_ids[lang] for ext, lang in _ext_to_lang().items()}
+        file_ids = array('i')
+        samples: List[List[str]] = [[] for _ in languages]
         total_files = 0
         
-        for root, dirs, files in os.walk(project_path):
-            # Skip common irrelevant directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['node_modules', '__pycache__', 'target', 'build']]
-            
-            for file in files:
-                if file.startswith('.'):
-                    continue
-                
-                file_path = os.path.join(root, file)
-                lang = self.detect_programming_language(file_path)
-                
-                if lang != 'unknown':
-                    if lang not in language_files:
-                        language_files[lang] = []
-                    language_files[lang].append(file_path)
-                
-                total_files += 1
-        
-        # Calcular estatísticas
+        # Varredura em largura: cada nível de diretórios é listado em paralelo
+        with ThreadPoolExecutor(max_workers=_SCAN_WORKERS) as pool:
+            frontier = [project_path]
+            while frontier:
+                next_frontier = []
+                for files, subdirs in pool.map(_scan_dir, frontier):
+                    total_files += len(files)
+                    next_frontier.extend(subdirs)
+                    for file_path, ext in files:
+                        lang_id = ext_to_id.get(ext)
+                        if lang_id is not None:
+                            file_ids.append(lang_id)
+                            if len(samples[lang_id]) < 3:
+                                samples[lang_id].append(file_path)
+                frontier = next_frontier
+        
+        # Estatísticas, linguagem principal e recomendações numa única passada
         stats = {}
-        for lang, files in language_files.items():
-            stats[lang] = {
-                "file_count": len(files),
-                "percentage": round(len(files) / total_files * 100, 1),
-                "sample_files": files[:3],  # Primeiros 3 arquivos como exemplo
-                "info": self.programming_languages.get(lang, {})
-            }
+        recommendations = []
+        primary_language = None
+        if file_ids:
+            counts = np.bincount(np.frombuffer(file_ids, dtype=np.intc), minlength=len(languages))
+            percentages = np.round(counts * (100.0 / total_files), 1)
+            primary_language = languages[int(np.argmax(counts))]
+            for lang_id in np.flatnonzero(counts):
+                lang = languages[lang_id]
+                stats[lang] = {
+                    "file_count": int(counts[lang_id]),
+                    "percentage": float(percentages[lang_id]),
+                    "sample_files": samples[lang_id],  # Primeiros 3 arquivos como exemplo
+                    "info": self.programming_languages.get(lang, {})
+                }
+                recommendations.extend(_LANGUAGE_RECOMMENDATIONS.get(lang, ()))
+        recommendations.extend(self._general_recommendations(len(stats)))
         
         return {
             "project_path": project_path,
             "total_files": total_files,
             "languages_detected": stats,
-            "primary_language": max(stats.keys(), key=lambda x: stats[x]["file_count"]) if stats else None,
-            "recommendations": self._get_project_recommendations(stats)
+            "primary_language": primary_language,
+            "recommendations": recommendations
         }
     
+    async def scan_project_languages_async(self, project_path: str) -> Dict[str, Any]:
+        """Escanear projeto sem bloquear o event loop (varredura em thread)"""
+        return await asyncio.to_thread(self.scan_project_languages, project_path)
+    
     def _get_project_recommendations(self, language_stats: Dict) -> List[str]:
         """Gerar recomendações baseadas nas linguagens detectadas"""
         recommendations = []
-        
-        for lang in language_stats.keys():
-            # Recomendações específicas por linguagem
-            if lang == 'pascal':
-                recommendations.append("📚 Pascal detectado - considere migração para Object Pascal ou Free Pascal")
-                recommendations.append("🔧 Use Lazarus IDE para desenvolvimento visual multiplataforma")
-            elif lang == 'python':
-                recommendations.append("🐍 Configure virtual environment para isolamento de dependências")
-                recommendations.append("✅ Implemente testes com pytest e type hints com mypy")
-            elif lang == 'javascript':
-                recommendations.append("📦 Use npm/yarn para gestão de dependências")
-                recommendations.append("🔧 Configure ESLint e Prettier para qualidade de código")
-        
-        # Recomendações gerais
-        if len(language_stats) > 3:
+        for lang in language_stats:
+            recommendations.extend(_LANGUAGE_RECOMMENDATIONS.get(lang, ()))
+        recommendations.extend(self._general_recommendations(len(language_stats)))
+        return recommendations
+    
+    @staticmethod
+    def _general_recommendations(language_count: int) -> List[str]:
+        """Recomendações gerais, dependentes só do número de linguagens"""
+        recommendations = []
+        if language_count > 3:
             recommendations.append("🏗️ Projeto multilinguagem - considere containerização com Docker")
-        
         recommendations.append("📊 Configure CI/CD para automação de builds e testes")
-        
         return recommendations
     
     async def analyze_and_improve(self, user_input: str, context: Dict = None) -> Dict[str, Any]:
         """Analisar situação e aplicar melhorias automaticamente"""
         try:
-            # Gerar resposta normal primeiro
-            response = await self.get_standard_response(user_input, context)
+            user_lower = user_input.lower()
+            has_triggers = bool(_matched_improvement_rules(user_lower) or _detect_langs_in_text(user_lower))
             
-            # Analisar oportunidades de melhoria
-            improvements = await self.identify_improvements(user_input, response, context)
+            # Saudações e pedidos de ajuda sem nenhum gatilho de melhoria dispensam análise,
+            # memoização e embedding
+            if not has_triggers and self._analyze_query_type(user_input) in _NO_ANALYSIS_QUERY_TYPES:
+                response = await self.get_standard_response(user_input, context)
+                return await self.format_enhanced_response(response, [], [])
+            
+            # Só a resposta padrão e as melhorias vindas da entrada são memoizadas; a saúde do
+            # sistema segue o próprio TTL e as ações rodam a cada chamada
+            key = self._memo_key(user_input, context)
+            cached = self._memo_get(key)
+            embedding = None
+            # Paráfrase só vale para consultas sem gatilhos: a entrada reaproveitada não tem ações
+            if cached is None and self.embed_fn is not None and not has_triggers:
+                try:
+                    embedding = await self.embed_fn(user_input)
+                except Exception as e:
+                    self.logger.debug(f"Embedding indisponível para memoização: {e}")
+                cached = self._memo_get_similar(embedding)
+            
+            if cached is not None:
+                response = dict(cached['response'], timestamp=datetime.now().isoformat())
+                input_improvements = cached['improvements']
+            else:
+                # Gerar resposta normal primeiro
+                response = await self.get_standard_response(user_input, context)
+                input_improvements = self._input_improvements(user_input)
+                self._memo_store(key, embedding, response, input_improvements)
+            
+            # Analisar oportunidades de melhoria (entrada + saúde atual do sistema)
+            improvements = self._merge_improvements(
+                input_improvements, await self._analyze_system_health()
+            )
             
             # Aplicar melhorias quando apropriado
             applied_improvements = []
             pending_confirmations = []
+            to_apply = []
             
             for improvement in improvements:
                 if await self.should_apply_automatically(improvement):
-                    result = await self.apply_improvement(improvement)
-                    if result['success']:
-                        applied_improvements.append(improvement)
-                        self.applied_improvements.append({
-                            'improvement': improvement,
-                            'result': result,
-                            'timestamp': datetime.now().isoformat()
-                        })
+                    to_apply.append(improvement)
                 else:
                     pending_confirmations.append(improvement)
             
+            results = await self._apply_improvements(to_apply)
+            if to_apply:
+                # Ações aplicadas mudam o estado do sistema: a próxima análise de saúde é refeita
+                self._health_cache = (float('-inf'), [])
+            for improvement, result in zip(to_apply, results):
+                if result['success']:
+                    applied_improvements.append(improvement)
+                    self.total_applied += 1
+                    self.applied_improvements.append({
+                        'improvement': improvement,
+                        'result': result,
+                        'timestamp_ns': _now_ns()
+                    })
+            
             # Formatar resposta com melhorias aplicadas
-            enhanced_response = await self.format_enhanced_response(
+            return await self.format_enhanced_response(
                 response, applied_improvements, pending_confirmations
             )
             
-            return enhanced_response
-            
         except Exception as e:
             self.logger.error(f"Erro na análise proativa: {e}")
             return await self.get_standard_response(user_input, context)
     
+    @staticmethod
+    def _fmt_ts(ns: int) -> str:
+        """Converter instante em nanossegundos para ISO 8601"""
+        return datetime.fromtimestamp(ns / 1e9).isoformat()
+    
+    def get_improvement_history(self) -> List[Dict[str, Any]]:
+        """Histórico de melhorias aplicadas na sessão, com instantes em ISO 8601"""
+        return [
+            {
+                'improvement': record['improvement'],
+                'success': record['result'].get('success', False),
+                'message': record['result'].get('message') or record['result'].get('error'),
+                'timestamp': self._fmt_ts(record['timestamp_ns'])
+            }
+            for record in self.applied_improvements
+        ]
+    
+    @staticmethod
+    def _memo_key(user_input: str, context: Dict = None) -> str:
+        """Chave de memoização: entrada normalizada e contexto"""
+        normalized = " ".join(user_input.lower().split()).encode('utf-8')
+        if context:
+            if ORJSON_AVAILABLE:
+                encoded = orjson.dumps(context, default=str,
+                                       option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+            else:
+                encoded = json.dumps(context, sort_keys=True, default=str).encode('utf-8')
+            normalized += b"\x00" + encoded
+        return hashlib.blake2b(normalized, digest_size=8).hexdigest()
+    
+    def _memo_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Buscar resposta padrão e melhorias da entrada memoizadas ainda válidas (LRU)"""
+        entry = self._response_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > _MEMO_TTL:
+            self._memo_discard(key)
+            return None
+        self._response_cache.move_to_end(key)
+        return entry[1]
+    
+    def _memo_get_similar(self, embedding: Optional[np.ndarray]) -> Optional[Dict[str, Any]]:
+        """Buscar entrada memoizada de consulta semanticamente equivalente"""
+        if embedding is None or not self._memo_embeddings:
+            return None
+        if self._memo_matrix is None:
+            self._memo_matrix_keys = list(self._memo_embeddings)
+            self._memo_matrix = np.stack([self._memo_embeddings[k] for k in self._memo_matrix_keys])
+        
+        scores = self._memo_matrix @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < _MEMO_SIMILARITY:
+            return None
+        return self._memo_get(self._memo_matrix_keys[best])
+    
+    def _memo_store(self, key: str, embedding: Optional[np.ndarray], response: Dict[str, Any],
+                    improvements: List[Dict]):
+        """Memoizar resposta padrão e melhorias da entrada, despejando a menos usada ao exceder _MEMO_SIZE"""
+        self._response_cache[key] = (time.monotonic(), {'response': response, 'improvements': improvements})
+        self._response_cache.move_to_end(key)
+        # Só entradas sem melhorias próprias entram no índice de paráfrases
+        if embedding is not None and not improvements:
+            self._memo_embeddings[key] = embedding
+            self._memo_matrix = None
+        if len(self._response_cache) > _MEMO_SIZE:
+            self._memo_discard(next(iter(self._response_cache)))
+    
+    def _memo_discard(self, key: str):
+        """Remover uma entrada memoizada"""
+        self._response_cache.pop(key, None)
+        if self._memo_embeddings.pop(key, None) is not None:
+            self._memo_matrix = None
+    
+    def invalidate_memo(self):
+        """Descartar respostas memoizadas (ex.: após mudar preferências)"""
+        self._response_cache.clear()
+        self._memo_embeddings.clear()
+        self._memo_matrix = None
+    
     async def get_standard_response(self, user_input: str, context: Dict = None) -> Dict[str, Any]:
         """Obter resposta padrão da IA"""
         # Implementar resposta básica usando a personalidade
@@ -529,173 +788,108 @@ class MamuteProactiveIA:
     
     async def identify_improvements(self, user_input: str, current_response: Dict, context: Dict = None) -> List[Dict]:
         """Identificar oportunidades de melhoria baseado na entrada do usuário"""
-        improvements = []
-        
+        return self._merge_improvements(
+            self._input_improvements(user_input), await self._analyze_system_health()
+        )
+    
+    def _input_improvements(self, user_input: str) -> List[Dict]:
+        """Melhorias sugeridas pela própria entrada (linguagens e palavras-chave)"""
         # Análise baseada em palavras-chave
         user_lower = user_input.lower()
+        improvements = []
         
-        # Detectar linguagens de programação mencionadas
-        detected_languages = []
-        for lang_name in self.programming_languages.keys():
-            if lang_name in user_lower:
-                detected_languages.append(lang_name)
+        # Análises específicas por linguagem mencionada
+        for lang in _detect_langs_in_text(user_lower):
+            improvements.extend(self._get_language_specific_improvements(lang, user_lower))
         
-        # Análises específicas por linguagem
-        for lang in detected_languages:
-            lang_improvements = self._get_language_specific_improvements(lang, user_input)
-            improvements.extend(lang_improvements)
+        # Solicitações detectadas por palavras-chave (otimização, limpeza, backup, dependências)
+        matched = _matched_improvement_rules(user_lower)
+        for index, (_, improvement) in enumerate(_KEYWORD_IMPROVEMENTS):
+            if (None, index) in matched:
+                improvements.append(dict(improvement))
         
-        # Detectar solicitações de otimização
-        if any(term in user_lower for term in ['lento', 'otimizar', 'melhorar performance', 'demora']):
+        return self._merge_improvements(improvements)
+    
+    @staticmethod
+    def _merge_improvements(*groups: List[Dict]) -> List[Dict]:
+        """Unir melhorias mantendo uma por ação (a de maior confiança)"""
+        # Entrada do usuário e saúde do sistema podem sugerir a mesma ação (ex.: limpar_logs)
+        improvements: Dict[str, Dict] = {}
+        for group in groups:
+            for improvement in group:
+                current = improvements.get(improvement['action'])
+                if current is None or improvement['confidence'] > current['confidence']:
+                    improvements[improvement['action']] = improvement
+        return list(improvements.values())
+    
+    def _get_language_specific_improvements(self, language: str, user_input: str) -> List[Dict]:
+        """Obter melhorias específicas para uma linguagem"""
+        entries = _LANGUAGE_KEYWORD_IMPROVEMENTS.get(language, ())
+        if not entries:
+            return []
+        
+        matched = _matched_improvement_rules(user_input.lower())
+        return [dict(improvement) for index, (_, improvement) in enumerate(entries)
+                if (language, index) in matched]
+    
+    async def _analyze_system_health(self) -> List[Dict]:
+        """Análise proativa da saúde do sistema"""
+        # Métricas mudam em segundos/minutos, não a cada mensagem: reaproveitar dentro do TTL
+        now = time.monotonic()
+        checked_at, cached = self._health_cache
+        if now - checked_at < self.user_preferences.get('health_check_ttl', 30.0):
+            return list(cached)
+        
+        improvements = []
+        
+        # Verificações independentes: rodam em paralelo e uma falha não descarta as demais
+        memory_usage, log_size, integrity_issues = await asyncio.gather(
+            self._get_memory_usage(),
+            self._get_log_size(),
+            self._check_data_integrity(),
+            return_exceptions=True
+        )
+        
+        # Verificar uso de memória
+        if isinstance(memory_usage, Exception):
+            self.logger.warning(f"Erro ao verificar uso de memória: {memory_usage}")
+        elif memory_usage > 80:
             improvements.append({
-                'type': 'optimization',
-                'action': 'otimizar_consultas',
-                'description': 'Otimizar consultas do banco de dados',
+                'type': 'system',
+                'action': 'otimizar_memoria',
+                'description': f'Otimizar uso de memória (atual: {memory_usage}%)',
                 'confidence': 0.9,
-                'impact': 'alto',
+                'impact': 'médio',
                 'safe': True
             })
-            
-        # Detectar problemas de espaço/limpeza
-        if any(term in user_lower for term in ['espaço', 'limpar', 'logs', 'disco cheio']):
+        
+        # Verificar logs antigos
+        if isinstance(log_size, Exception):
+            self.logger.warning(f"Erro ao verificar tamanho dos logs: {log_size}")
+        elif log_size > 100:  # MB
             improvements.append({
                 'type': 'maintenance',
                 'action': 'limpar_logs',
-                'description': 'Limpar logs antigos para liberar espaço',
+                'description': f'Limpar logs antigos ({log_size}MB)',
                 'confidence': 0.95,
-                'impact': 'médio',
+                'impact': 'baixo',
                 'safe': True
             })
         
-        # Detectar solicitações de backup
-        if any(term in user_lower for term in ['backup', 'salvar', 'proteger dados']):
+        # Verificar integridade dos dados
+        if isinstance(integrity_issues, Exception):
+            self.logger.warning(f"Erro ao verificar integridade dos dados: {integrity_issues}")
+        elif integrity_issues:
             improvements.append({
-                'type': 'backup',
-                'action': 'backup_automatico',
-                'description': 'Criar backup automático dos dados',
+                'type': 'maintenance',
+                'action': 'verificar_integridade',
+                'description': f'Corrigir {len(integrity_issues)} problemas de integridade',
                 'confidence': 0.85,
-                'impact': 'crítico',
-                'safe': False  # Requer confirmação
-            })
-        
-        # Detectar problemas de dependências
-        if any(term in user_lower for term in ['erro', 'módulo não encontrado', 'importerror', 'pascal', 'compilar']):
-            improvements.append({
-                'type': 'dependency',
-                'action': 'instalar_dependencia',
-                'description': 'Instalar dependências ou ferramentas necessárias',
-                'confidence': 0.8,
                 'impact': 'alto',
                 'safe': True
             })
         
-        # Análise proativa do sistema
-        system_improvements = await self._analyze_system_health()
-        improvements.extend(system_improvements)
-        
-        return improvements
-    
-    def _get_language_specific_improvements(self, language: str, user_input: str) -> List[Dict]:
-        """Obter melhorias específicas para uma linguagem"""
-        improvements = []
-        user_lower = user_input.lower()
-        
-        if language == 'pascal':
-            # Melhorias específicas para Pascal
-            if any(term in user_lower for term in ['compilar', 'compilation', 'erro de compilação']):
-                improvements.append({
-                    'type': 'compilation',
-                    'action': 'configurar_pascal',
-                    'description': 'Configurar ambiente Pascal/Free Pascal',
-                    'confidence': 0.9,
-                    'impact': 'alto',
-                    'safe': True,
-                    'language': 'pascal'
-                })
-            
-            if any(term in user_lower for term in ['modernizar', 'atualizar', 'migrar']):
-                improvements.append({
-                    'type': 'modernization',
-                    'action': 'modernizar_pascal',
-                    'description': 'Modernizar código Pascal para Object Pascal',
-                    'confidence': 0.8,
-                    'impact': 'alto',
-                    'safe': False,
-                    'language': 'pascal'
-                })
-        
-        elif language == 'python':
-            # Melhorias específicas para Python
-            if any(term in user_lower for term in ['dependências', 'pip', 'install']):
-                improvements.append({
-                    'type': 'dependency',
-                    'action': 'configurar_python_env',
-                    'description': 'Configurar ambiente virtual Python',
-                    'confidence': 0.95,
-                    'impact': 'médio',
-                    'safe': True,
-                    'language': 'python'
-                })
-        
-        elif language == 'javascript':
-            # Melhorias específicas para JavaScript
-            if any(term in user_lower for term in ['npm', 'dependencies', 'node_modules']):
-                improvements.append({
-                    'type': 'dependency',
-                    'action': 'limpar_node_modules',
-                    'description': 'Limpar e reinstalar node_modules',
-                    'confidence': 0.85,
-                    'impact': 'médio',
-                    'safe': True,
-                    'language': 'javascript'
-                })
-        
-        return improvements
-    
-    async def _analyze_system_health(self) -> List[Dict]:
-        """Análise proativa da saúde do sistema"""
-        improvements = []
-        
-        try:
-            # Verificar uso de memória
-            memory_usage = await self._get_memory_usage()
-            if memory_usage > 80:
-                improvements.append({
-                    'type': 'system',
-                    'action': 'otimizar_memoria',
-                    'description': f'Otimizar uso de memória (atual: {memory_usage}%)',
-                    'confidence': 0.9,
-                    'impact': 'médio',
-                    'safe': True
-                })
-            
-            # Verificar logs antigos
-            log_size = await self._get_log_size()
-            if log_size > 100:  # MB
-                improvements.append({
-                    'type': 'maintenance',
-                    'action': 'limpar_logs',
-                    'description': f'Limpar logs antigos ({log_size}MB)',
-                    'confidence': 0.95,
-                    'impact': 'baixo',
-                    'safe': True
-                })
-            
-            # Verificar integridade dos dados
-            integrity_issues = await self._check_data_integrity()
-            if integrity_issues:
-                improvements.append({
-                    'type': 'maintenance',
-                    'action': 'verificar_integridade',
-                    'description': f'Corrigir {len(integrity_issues)} problemas de integridade',
-                    'confidence': 0.85,
-                    'impact': 'alto',
-                    'safe': True
-                })
-            
-        except Exception as e:
-            self.logger.warning(f"Erro na análise do sistema: {e}")
-        
+        self._health_cache = (now, list(improvements))
         return improvements
     
     async def should_apply_automatically(self, improvement: Dict) -> bool:
@@ -712,38 +906,31 @@ class MamuteProactiveIA:
         if not improvement.get('safe', False):
             return False
         
-        # Verificar preferências do usuário
-        improvement_type = improvement['type']
-        if improvement_type == 'optimization' and not self.user_preferences['auto_apply_optimizations']:
-            return False
-        elif improvement_type == 'maintenance' and not self.user_preferences['auto_apply_maintenance']:
-            return False
-        elif improvement_type == 'system' and self.user_preferences['ask_before_system_changes']:
-            return False
-        
-        return True
+        # Verificar preferências do usuário (tipos sem preferência associada são liberados)
+        gate = _TYPE_PREFERENCE_GATES.get(improvement['type'])
+        return gate is None or bool(self.user_preferences[gate[0]]) is gate[1]
     
     async def apply_improvement(self, improvement: Dict) -> Dict[str, Any]:
         """Aplicar uma melhoria específica"""
         action_name = improvement['action']
+        action_func = self.available_actions.get(action_name)
         
-        if action_name not in self.available_actions:
+        if action_func is None:
             return {
                 'success': False,
                 'error': f"Ação '{action_name}' não disponível",
-                'timestamp': datetime.now().isoformat()
+                'timestamp_ns': _now_ns()
             }
         
         try:
             self.logger.info(f"🔧 Aplicando melhoria: {improvement['description']}")
             
-            action_func = self.available_actions[action_name]
             result = await action_func(improvement)
             
             result.update({
                 'improvement': improvement,
                 'applied_automatically': True,
-                'timestamp': datetime.now().isoformat()
+                'timestamp_ns': _now_ns()
             })
             
             return result
@@ -754,9 +941,33 @@ class MamuteProactiveIA:
                 'success': False,
                 'error': str(e),
                 'improvement': improvement,
-                'timestamp': datetime.now().isoformat()
+                'timestamp_ns': _now_ns()
             }
     
+    async def _apply_improvements(self, improvements: List[Dict]) -> List[Dict[str, Any]]:
+        """Aplicar melhorias: ações independentes em paralelo, as demais em sequência"""
+        results: List[Optional[Dict[str, Any]]] = [None] * len(improvements)
+        parallel, sequential, seen = [], [], set()
+        
+        for index, improvement in enumerate(improvements):
+            action = improvement['action']
+            # Cada ação entra no lote paralelo uma única vez; repetições não podem disputar os mesmos recursos
+            if action in _CONCURRENCY_SAFE_ACTIONS and action not in seen:
+                seen.add(action)
+                parallel.append(index)
+            else:
+                sequential.append(index)
+        
+        if parallel:
+            done = await asyncio.gather(*(self.apply_improvement(improvements[i]) for i in parallel))
+            for index, result in zip(parallel, done):
+                results[index] = result
+        
+        for index in sequential:
+            results[index] = await self.apply_improvement(improvements[index])
+        
+        return results
+    
     # Implementação das ações específicas
     async def optimize_database_queries(self, improvement: Dict) -> Dict[str, Any]:
         """Otimizar consultas do banco de dados"""
@@ -764,10 +975,9 @@ class MamuteProactiveIA:
             # Implementar otimizações reais
             optimizations_applied = []
             
-            # Atualizar estatísticas
-            with self.db_manager.get_connection() as conn:
-                conn.execute("ANALYZE;")
-                optimizations_applied.append("Estatísticas atualizadas")
+            # Atualizar estatísticas (bloqueante: roda em thread, fora do event loop)
+            await asyncio.to_thread(self.db_manager.execute_maintenance, "ANALYZE;")
+            optimizations_applied.append("Estatísticas atualizadas")
             
             # Reindexar se necessário
             await self._reindex_if_needed()
@@ -789,16 +999,11 @@ class MamuteProactiveIA:
             if not logs_dir.exists():
                 return {'success': True, 'message': 'Nenhum log encontrado para limpar'}
             
-            cutoff_date = datetime.now() - timedelta(days=30)
-            deleted_files = []
-            total_size_freed = 0
-            
-            for log_file in logs_dir.glob("*.log*"):
-                if log_file.stat().st_mtime < cutoff_date.timestamp():
-                    size = log_file.stat().st_size
-                    log_file.unlink()
-                    deleted_files.append(log_file.name)
-                    total_size_freed += size
+            # Limite calculado uma vez, direto em segundos de época (comparável a st_mtime)
+            cutoff_ts = time.time() - _LOG_RETENTION_DAYS * 86400
+            removed = await asyncio.to_thread(self._remove_logs_older_than, logs_dir, cutoff_ts)
+            deleted_files = [name for name, _ in removed]
+            total_size_freed = sum(size for _, size in removed)
             
             return {
                 'success': True,
@@ -809,14 +1014,38 @@ class MamuteProactiveIA:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def _remove_logs_older_than(logs_dir: Path, cutoff_ts: float) -> List[Tuple[str, int]]:
+        """Apagar logs modificados antes de cutoff_ts; devolve (nome, tamanho) dos removidos (bloqueante)"""
+        with os.scandir(logs_dir) as entries:
+            log_entries = [entry for entry in entries if '.log' in entry.name and entry.is_file()]
+        
+        def remove_if_old(entry: os.DirEntry) -> Optional[Tuple[str, int]]:
+            # Um único stat por arquivo fornece data e tamanho
+            info = entry.stat()
+            if info.st_mtime >= cutoff_ts:
+                return None
+            os.unlink(entry.path)
+            return entry.name, info.st_size
+        
+        # stat/unlink de muitos arquivos rotacionados: distribuídos entre threads
+        with ThreadPoolExecutor(max_workers=_LOG_CLEAN_WORKERS) as pool:
+            return [removed for removed in pool.map(remove_if_old, log_entries) if removed]
+    
+    @cached_property
+    def backup_system(self) -> Optional['MamuteBackupSystem']:
+        """Sistema de backup, criado no primeiro uso (None se indisponível)"""
+        return MamuteBackupSystem() if BACKUP_AVAILABLE else None
+    
     async def create_automatic_backup(self, improvement: Dict) -> Dict[str, Any]:
         """Criar backup automático"""
         try:
-            # Integrar com sistema de backup existente
-            from backup_system import MamuteBackupSystem
+            # Integrar com sistema de backup existente (pg_dump bloqueia: roda em thread)
+            backup_system = await asyncio.to_thread(lambda: self.backup_system)
+            if backup_system is None:
+                return {'success': False, 'error': 'Sistema de backup não disponível (backup_system)'}
             
-            backup_system = MamuteBackupSystem()
-            result = backup_system.create_database_backup()
+            result = await asyncio.to_thread(backup_system.create_database_backup)
             
             return {
                 'success': True,
@@ -850,31 +1079,35 @@ class MamuteProactiveIA:
     
     async def format_enhanced_response(self, original_response: Dict, applied: List, pending: List) -> Dict[str, Any]:
         """Formatar resposta com melhorias aplicadas"""
-        response_text = original_response['response']
+        # Partes montadas em lista e unidas no fim (evita cópias a cada concatenação)
+        parts = [original_response['response']]
         
         # Adicionar informações sobre melhorias aplicadas
         if applied:
             success_emoji = self.personality.get_emoji('success')
-            response_text += f"\\n\\n{success_emoji} **Melhorias Aplicadas Automaticamente:**\\n"
-            
-            for improvement in applied:
-                response_text += f"✅ {improvement['description']}\\n"
+            parts.append(f"\\n\\n{success_emoji} **Melhorias Aplicadas Automaticamente:**\\n")
+            parts.extend(f"✅ {improvement['description']}\\n" for improvement in applied)
         
         # Adicionar melhorias pendentes de confirmação
         if pending:
             help_emoji = self.personality.get_emoji('help')
-            response_text += f"\\n\\n{help_emoji} **Melhorias Sugeridas (precisam de confirmação):**\\n"
-            
-            for improvement in pending:
-                response_text += f"🔄 {improvement['description']} (digite 'aplicar {improvement['action']}' para confirmar)\\n"
+            parts.append(f"\\n\\n{help_emoji} **Melhorias Sugeridas (precisam de confirmação):**\\n")
+            parts.extend(
+                f"🔄 {improvement['description']} (digite 'aplicar {improvement['action']}' para confirmar)\\n"
+                for improvement in pending
+            )
         
         # Adicionar estatísticas da sessão
         if applied or pending:
             stats_emoji = self.personality.get_emoji('data')
-            response_text += f"\\n\\n{stats_emoji} **Estatísticas:**\\n"
-            response_text += f"• Melhorias aplicadas: {len(applied)}\\n"
-            response_text += f"• Aguardando confirmação: {len(pending)}\\n"
-            response_text += f"• Total aplicadas na sessão: {len(self.applied_improvements)}"
+            parts.append(
+                f"\\n\\n{stats_emoji} **Estatísticas:**\\n"
+                f"• Melhorias aplicadas: {len(applied)}\\n"
+                f"• Aguardando confirmação: {len(pending)}\\n"
+                f"• Total aplicadas na sessão: {self.total_applied}"
+            )
+        
+        response_text = "".join(parts)
         
         return {
             'response': response_text,
@@ -884,7 +1117,7 @@ class MamuteProactiveIA:
             'timestamp': datetime.now().isoformat(),
             'proactive_mode': True,
             'session_stats': {
-                'total_applied': len(self.applied_improvements),
+                'total_applied': self.total_applied,
                 'current_applied': len(applied),
                 'current_pending': len(pending)
             }
@@ -893,16 +1126,18 @@ class MamuteProactiveIA:
     # Métodos auxiliares
     def _analyze_query_type(self, query: str) -> str:
         """Analisar tipo de consulta"""
-        query_lower = query.lower().strip()
-        
-        if any(term in query_lower for term in ['melhorar', 'otimizar', 'acelerar', 'corrigir']):
-            return 'improvement_request'
-        elif any(term in query_lower for term in ['oi', 'olá', 'hello']):
-            return 'greeting'
-        elif any(term in query_lower for term in ['ajuda', 'help']):
-            return 'help'
-        else:
-            return 'general'
+        return self._classify_query(query.lower().strip())
+    
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _classify_query(query_lower: str) -> str:
+        """Classificar consulta normalizada (memoizado: saudações e pedidos de ajuda se repetem)"""
+        # Uma passada acha todos os termos; vence a categoria de maior prioridade
+        categories = {_QUERY_TYPE_BY_TERM[term] for term in _QUERY_TYPE_TERMS_RE.findall(query_lower)}
+        for query_type, _ in _QUERY_TYPE_RULES:
+            if query_type in categories:
+                return query_type
+        return 'general'
     
     async def _handle_improvement_request(self, user_input: str) -> str:
         """Lidar com solicitações explícitas de melhoria"""
@@ -927,12 +1162,17 @@ class MamuteProactiveIA:
     
     async def _get_log_size(self) -> float:
         """Obter tamanho total dos logs em MB"""
+        # stat() de cada arquivo é bloqueante: roda em thread para não travar o event loop
+        return await asyncio.to_thread(self._log_size_sync)
+    
+    @staticmethod
+    def _log_size_sync() -> float:
+        """Somar o tamanho dos logs em MB (bloqueante)"""
         try:
-            logs_dir = Path("logs")
-            if not logs_dir.exists():
-                return 0.0
-            
-            total_size = sum(f.stat().st_size for f in logs_dir.glob("*.log*"))
+            # scandir numa única passada, sem objetos Path por arquivo
+            with os.scandir("logs") as entries:
+                total_size = sum(entry.stat(follow_symlinks=False).st_size for entry in entries
+                                 if '.log' in entry.name and entry.is_file(follow_symlinks=False))
             return total_size / 1024 / 1024
         except Exception:
             return 0.0
@@ -950,22 +1190,14 @@ class MamuteProactiveIA:
     
     async def _detect_missing_dependencies(self) -> List[str]:
         """Detectar dependências em falta"""
-        required_deps = ['psutil', 'schedule', 'matplotlib', 'seaborn']
-        missing = []
-        
-        for dep in required_deps:
-            try:
-                __import__(dep)
-            except ImportError:
-                missing.append(dep)
-        
-        return missing
+        # Resultado reaproveitado dentro da mesma janela de _DEPS_CHECK_TTL segundos
+        return list(_missing_dependencies(int(time.monotonic() // _DEPS_CHECK_TTL)))
     
     async def _reindex_if_needed(self):
         """Reindexar banco se necessário"""
         try:
-            with self.db_manager.get_connection() as conn:
-                conn.execute("REINDEX DATABASE CONCURRENTLY;")
+            # Pode levar minutos: conexão dedicada em thread, sem travar o event loop
+            await asyncio.to_thread(self.db_manager.execute_maintenance, "REINDEX DATABASE CONCURRENTLY;")
         except Exception as e:
             self.logger.warning(f"Não foi possível reindexar: {e}")
     
@@ -17,6 +17,14 @@ import websockets
 from threading import Thread
 import time
 
+# orjson serializa os payloads WebSocket bem mais rápido que json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 # Adicionar o diretório principal ao path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
@@ -78,6 +86,11 @@ class NotificationSystem:
             'email_to': os.getenv('EMAIL_TO', '').split(',') if os.getenv('EMAIL_TO') else []
         }
         
+        # Serialização rápida dos payloads WebSocket (desative com MAMUTE_FAST_JSON=false)
+        self.fast_json = ORJSON_AVAILABLE and os.getenv('MAMUTE_FAST_JSON', 'true').lower() == 'true'
+        # Lotes de notify_batch em um único frame 'notification_batch' (desative com MAMUTE_WS_BATCH=false)
+        self.batch_frames = os.getenv('MAMUTE_WS_BATCH', 'true').lower() == 'true'
+        
         # WebSocket connections
         self.websocket_connections = set()
         self.websocket_server = None
@@ -127,8 +140,12 @@ class NotificationSystem:
         except Exception as e:
             self.logger.warning(f"Erro ao criar tabela de notificações: {e}")
     
-    async def send_notification(self, notification: Notification) -> bool:
-        """Enviar notificação através de todos os canais especificados"""
+    async def send_notification(self, notification: Notification, broadcast: bool = True) -> bool:
+        """Enviar notificação através de todos os canais especificados
+        
+        Com broadcast=False o canal WebSocket é ignorado, para que o chamador
+        agrupe o envio com _broadcast_batch.
+        """
         try:
             success_count = 0
             
@@ -152,7 +169,8 @@ class NotificationSystem:
                         success_count += 1
                     
                     elif channel == NotificationChannel.WEBSOCKET:
-                        await self._send_to_websockets(notification)
+                        if broadcast:
+                            await self._send_to_websockets(notification)
                         success_count += 1
                     
                     elif channel == NotificationChannel.EMAIL:
@@ -230,12 +248,15 @@ class NotificationSystem:
         except Exception as e:
             self.logger.warning(f"Erro ao salvar notificação no banco: {e}")
     
-    async def _send_to_websockets(self, notification: Notification):
-        """Enviar notificação via WebSocket para clientes conectados"""
-        if not self.websocket_connections:
-            return
-        
-        notification_data = {
+    def _dumps(self, data: Dict[str, Any]) -> str:
+        """Serializar mensagem WebSocket como texto JSON"""
+        if self.fast_json:
+            return orjson.dumps(data).decode('utf-8')
+        return json.dumps(data)
+    
+    def _websocket_payload(self, notification: Notification) -> Dict[str, Any]:
+        """Converter notificação para o formato enviado via WebSocket"""
+        return {
             'id': notification.id,
             'title': notification.title,
             'message': notification.message,
@@ -244,13 +265,33 @@ class NotificationSystem:
             'source': notification.source,
             'metadata': notification.metadata
         }
+    
+    async def _send_to_websockets(self, notification: Notification):
+        """Enviar notificação via WebSocket para clientes conectados"""
+        if not self.websocket_connections:
+            return
         
-        message = json.dumps({
+        message = self._dumps({
             'type': 'notification',
-            'data': notification_data
+            'data': self._websocket_payload(notification)
         })
         
-        # Enviar para todas as conexões ativas
+        await self._send_websocket_message(message)
+    
+    async def _broadcast_batch(self, notifications: List[Notification]):
+        """Enviar várias notificações em um único frame WebSocket"""
+        if not self.websocket_connections or not notifications:
+            return
+        
+        message = self._dumps({
+            'type': 'notification_batch',
+            'items': [self._websocket_payload(n) for n in notifications]
+        })
+        
+        await self._send_websocket_message(message)
+    
+    async def _send_websocket_message(self, message: str):
+        """Enviar mensagem já serializada para todas as conexões ativas"""
         disconnected_connections = set()
         
         for websocket in self.websocket_connections.copy():
@@ -378,6 +419,30 @@ Este é um email automático do sistema Mamute.
         notification = self.create_notification(title, message, NotificationLevel.SUCCESS, **kwargs)
         return await self.send_notification(notification)
     
+    async def notify_batch(self, items: List[tuple]) -> int:
+        """Enviar lote de notificações (nível, título, mensagem)
+        
+        Console, log, banco, email, histórico e subscribers seguem por item; no
+        WebSocket o lote vai em um único frame 'notification_batch' (ou em um
+        frame por item com MAMUTE_WS_BATCH=false).
+        """
+        notifications = [
+            self.create_notification(title, message, NotificationLevel(level))
+            for level, title, message in items
+        ]
+        
+        sent = 0
+        for notification in notifications:
+            if await self.send_notification(notification, broadcast=not self.batch_frames):
+                sent += 1
+        
+        if self.batch_frames:
+            await self._broadcast_batch([
+                n for n in notifications if NotificationChannel.WEBSOCKET in n.channels
+            ])
+        
+        return sent
+    
     def get_recent_notifications(self, limit: int = 20, level: NotificationLevel = None) -> List[Dict[str, Any]]:
         """Obter notificações recentes"""
         notifications = self.recent_notifications
@@ -479,7 +544,7 @@ Este é um email automático do sistema Mamute.
             try:
                 # Enviar notificações recentes ao conectar
                 recent_notifications = self.get_recent_notifications(10)
-                await websocket.send(json.dumps({
+                await websocket.send(self._dumps({
                     'type': 'initial_notifications',
                     'data': recent_notifications
                 }))
@@ -28,6 +28,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from src.utils.config import Config
 from src.utils.logger import setup_logger
 from src.database.connection import DatabaseManager
+from src.utils.cpu import CpuSampler
 
 @dataclass
 class PerformanceMetric:
@@ -79,6 +80,9 @@ class PerformanceAnalyzer:
         self.cached_analyses = {}
         self.cache_ttl = 300  # 5 minutos
         
+        # Amostrador de CPU próprio: cada coleta retorna o uso desde a anterior, sem bloquear
+        self._cpu_sampler = CpuSampler()
+        
         # Configurar extensões do PostgreSQL para análise
         self._setup_pg_extensions()
         
@@ -114,7 +118,7 @@ class PerformanceAnalyzer:
                 )]
             
             # Métricas de CPU
-            cpu_percent = psutil.cpu_percent(interval=1)
+            cpu_percent = self._cpu_sampler.percent()
             cpu_count = psutil.cpu_count()
             cpu_freq = psutil.cpu_freq()
             
@@ -871,32 +871,39 @@ class ReportGenerator:
         self.logger.info("- Relatórios semanais: Segunda-feira 09:00")
         self.logger.info("- Relatórios mensais: Primeiro dia do mês 10:00")
     
+    def _report_search_dirs(self, report_type: str = "all") -> List[tuple]:
+        """Diretórios de relatórios (diretório, tipo) a pesquisar"""
+        search_dirs = []
+        if report_type in ["all", "daily"]:
+            search_dirs.append((self.daily_dir, "daily"))
+        if report_type in ["all", "weekly"]:
+            search_dirs.append((self.weekly_dir, "weekly"))
+        if report_type in ["all", "monthly"]:
+            search_dirs.append((self.monthly_dir, "monthly"))
+        if report_type in ["all", "custom"]:
+            search_dirs.append((self.custom_dir, "custom"))
+        return search_dirs
+    
+    @staticmethod
+    def _report_info(file_path: Path, rtype: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Montar informações de um relatório a partir do seu stat"""
+        return {
+            'name': file_path.stem,
+            'type': rtype,
+            'file_path': str(file_path),
+            'size_mb': round(stat.st_size / (1024*1024), 2),
+            'created_at': datetime.fromtimestamp(stat.st_ctime).isoformat(),
+            'modified_at': datetime.fromtimestamp(stat.st_mtime).isoformat()
+        }
+    
     def list_reports(self, report_type: str = "all") -> List[Dict[str, Any]]:
         """Listar relatórios disponíveis"""
         reports = []
         
         try:
-            search_dirs = []
-            if report_type in ["all", "daily"]:
-                search_dirs.append((self.daily_dir, "daily"))
-            if report_type in ["all", "weekly"]:
-                search_dirs.append((self.weekly_dir, "weekly"))
-            if report_type in ["all", "monthly"]:
-                search_dirs.append((self.monthly_dir, "monthly"))
-            if report_type in ["all", "custom"]:
-                search_dirs.append((self.custom_dir, "custom"))
-            
-            for directory, rtype in search_dirs:
+            for directory, rtype in self._report_search_dirs(report_type):
                 for file_path in directory.glob("*.html"):
-                    stat = file_path.stat()
-                    reports.append({
-                        'name': file_path.stem,
-                        'type': rtype,
-                        'file_path': str(file_path),
-                        'size_mb': round(stat.st_size / (1024*1024), 2),
-                        'created_at': datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                        'modified_at': datetime.fromtimestamp(stat.st_mtime).isoformat()
-                    })
+                    reports.append(self._report_info(file_path, rtype, file_path.stat()))
             
             # Ordenar por data de criação (mais recente primeiro)
             reports.sort(key=lambda x: x['created_at'], reverse=True)
@@ -905,6 +912,39 @@ class ReportGenerator:
             self.logger.error(f"Erro ao listar relatórios: {e}")
         
         return reports
+    
+    def latest_report_and_count(self, report_type: str = "all") -> tuple:
+        """Obter o relatório mais recente e o total de relatórios em uma única passada
+        
+        Returns:
+            Tupla (informações do relatório mais recente ou None, total de relatórios)
+        """
+        latest = None
+        total = 0
+        
+        try:
+            for directory, rtype in self._report_search_dirs(report_type):
+                if not directory.is_dir():
+                    continue
+                
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if not entry.name.endswith(".html") or not entry.is_file():
+                            continue
+                        
+                        total += 1
+                        stat = entry.stat()
+                        if latest is None or stat.st_ctime > latest[2].st_ctime:
+                            latest = (entry.path, rtype, stat)
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao obter último relatório: {e}")
+        
+        if latest is None:
+            return None, total
+        
+        path, rtype, stat = latest
+        return self._report_info(Path(path), rtype, stat), total
 
 # Instância global do gerador de relatórios
 report_generator = ReportGenerator()
@@ -2,7 +2,7 @@
 Agente principal de IA
 """
 import openai
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 import json
 import time
 import uuid
@@ -143,6 +143,36 @@ class AIAgent:
         
         return messages
     
+    def stream_response(self, message: str, documents: List[Dict[str, Any]],
+                        context: Optional[List[Dict]] = None) -> Iterator[str]:
+        """
+        Gera resposta baseada em documentos, entregando o texto em partes
+        
+        Args:
+            message: Pergunta do usuário
+            documents: Documentos encontrados pela busca semântica
+            context: Contexto adicional da conversa
+        
+        Yields:
+            str: Trechos da resposta na ordem em que o modelo os produz
+        """
+        excerpts = "\n\n".join(f"[{doc['title']}]\n{doc['content']}" for doc in documents)
+        prompt = (f"Responda com base nos documentos abaixo.\n\n{excerpts}\n\n"
+                  f"Pergunta: {message}")
+        messages = self._prepare_messages(prompt, context)
+        
+        stream = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=messages,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+            stream=True
+        )
+        
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
     def _save_conversation(self, session_id: str, user_message: str, ai_response: str, 
                           tokens_used: int, response_time: float):
         """
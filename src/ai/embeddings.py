@@ -60,6 +60,32 @@ class EmbeddingManager:
             self.logger.error(f"Erro ao criar embedding: {e}")
             raise
     
+    def create_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Cria embeddings para vários textos em uma única requisição
+        
+        Args:
+            texts: Textos para criar embeddings
+        
+        Returns:
+            List[List[float]]: Vetores de embedding, na ordem dos textos
+        """
+        if not self.client:
+            raise ValueError("Cliente OpenAI não configurado")
+        
+        try:
+            response = self.client.embeddings.create(
+                model=self.embedding_model,
+                input=texts
+            )
+            data = sorted(response.data, key=lambda item: item.index)
+            self.logger.debug(f"Embeddings criados em lote para {len(texts)} textos")
+            return [item.embedding for item in data]
+            
+        except Exception as e:
+            self.logger.error(f"Erro ao criar embeddings em lote: {e}")
+            raise
+    
     def add_document(self, title: str, content: str, file_path: Optional[str] = None, 
                     file_type: Optional[str] = None, metadata: Optional[Dict] = None) -> int:
         """
@@ -116,7 +142,26 @@ class EmbeddingManager:
         try:
             # Criar embedding da consulta
             query_embedding = self.create_embedding(query)
-            
+        except Exception as e:
+            self.logger.error(f"Erro na busca semântica: {e}")
+            return []
+        
+        return self.search_by_embedding(query_embedding, limit, threshold)
+    
+    def search_by_embedding(self, query_embedding: List[float], limit: int = 5,
+                            threshold: float = 0.7) -> List[Dict[str, Any]]:
+        """
+        Busca documentos similares a partir de um embedding já calculado
+        
+        Args:
+            query_embedding: Vetor de embedding da consulta
+            limit: Número máximo de resultados
+            threshold: Limiar de similaridade (0-1)
+        
+        Returns:
+            List[Dict]: Documentos similares ordenados por relevância
+        """
+        try:
             # Buscar documentos similares
             # Nota: Esta implementação usa similaridade de cosseno simples
             # Para produção, considere usar pg_vector ou similar
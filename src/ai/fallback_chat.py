@@ -2,7 +2,8 @@
 Sistema de chat fallback para quando OpenAI não está disponível
 """
 import datetime
-from typing import Dict, Any
+from functools import partial
+from typing import Callable, Dict, Any
 from ..utils.logger import setup_logger
 
 class FallbackChatSystem:
@@ -28,91 +29,102 @@ class FallbackChatSystem:
         import time
         start_time = time.time()
         
-        message_lower = message.lower()
+        ai_response = self._route(message.lower())()
         
-        # Saudações contextuais
-        now = datetime.datetime.now()
-        hour = now.hour
+        response_time = time.time() - start_time
         
+        return {
+            "response": ai_response,
+            "tokens_used": 0,
+            "response_time": response_time,
+            "session_id": session_id,
+            "mode": "fallback"
+        }
+    
+    def _route(self, message_lower: str) -> Callable[[], str]:
+        """Escolher o tratador da mensagem (sem executá-lo)"""
+        # Saudações contextuais
         if any(palavra in message_lower for palavra in ['oi', 'olá', 'hello', 'boa', 'bom', 'hey']):
-            if hour < 12:
-                saudacao = f"🌅 Bom dia! Sou o {self.ai_name}, sua IA especialista em PostgreSQL!"
-            elif hour < 18:
-                saudacao = f"🌤️ Boa tarde! Sou o {self.ai_name}, como posso ajudar com PostgreSQL hoje?"
-            else:
-                saudacao = f"🌙 Boa noite! Sou o {self.ai_name}, pronto para ajudar com suas consultas!"
-            
-            ai_response = f"{saudacao}\n\n📋 Posso ajudar com:\n• Consultas SQL\n• Otimização de banco\n• Comandos PostgreSQL\n• Previsão do tempo no Brasil\n\nComo posso ajudar?"
+            return self._handle_greeting
         
         # Previsão do tempo
         elif any(palavra in message_lower for palavra in ['tempo', 'clima', 'chuva', 'sol', 'temperatura', 'previsao']):
-            ai_response = self._handle_weather_query(message_lower)
+            return partial(self._handle_weather_query, message_lower)
         
         # Agradecimentos
         elif any(palavra in message_lower for palavra in ['obrigado', 'obrigada', 'valeu', 'muito obrigado', 'agradeço', 'grato', 'grata']):
-            ai_response = self._handle_thanks()
+            return self._handle_thanks
         
         # Despedidas
         elif any(palavra in message_lower for palavra in ['tchau', 'até logo', 'até mais', 'adeus', 'bye', 'até breve', 'falou', 'tá bom', 'ok obrigado', 'não precisa mais', 'é isso']):
-            ai_response = self._handle_goodbye()
+            return self._handle_goodbye
         
         # Análise e melhorias do banco
         elif any(palavra in message_lower for palavra in ['analisar', 'análise', 'melhorar', 'melhorias', 'otimizar', 'problemas', 'sugestões']):
-            ai_response = self._handle_database_analysis(message_lower)
+            return partial(self._handle_database_analysis, message_lower)
         
         # PostgreSQL help
         elif any(palavra in message_lower for palavra in ['select', 'sql', 'postgresql', 'banco', 'tabela', 'consulta']):
             # Verificar se é uma pergunta específica sobre o banco atual
             if self._is_database_query(message_lower):
-                ai_response = self._handle_database_query(message_lower)
+                return partial(self._handle_database_query, message_lower)
             else:
-                ai_response = self._handle_sql_query(message_lower)
+                return partial(self._handle_sql_query, message_lower)
         
         # JOINs
         elif 'join' in message_lower:
-            ai_response = self._handle_join_query()
+            return self._handle_join_query
         
         # Performance/Índices
         elif any(palavra in message_lower for palavra in ['índice', 'index', 'performance', 'otimiz', 'velocidade']):
-            ai_response = self._handle_performance_query()
+            return self._handle_performance_query
         
         # Funções PostgreSQL
         elif any(palavra in message_lower for palavra in ['função', 'function', 'agregad', 'count', 'sum', 'avg']):
-            ai_response = self._handle_functions_query()
+            return self._handle_functions_query
         
         # Agradecimentos
         elif any(palavra in message_lower for palavra in ['obrigad', 'valeu', 'muito bem', 'excelente', 'perfeito', 'ótimo trabalho']):
-            ai_response = self._handle_thanks()
+            return self._handle_thanks
         
         # Despedidas
         elif any(palavra in message_lower for palavra in ['tchau', 'até logo', 'até mais', 'adeus', 'bye', 'finalizando', 'encerrar']):
-            ai_response = self._handle_farewell()
+            return self._handle_farewell
         
         # Mamute info
         elif any(palavra in message_lower for palavra in ['quem', 'você', 'mamute', 'sobre']):
-            ai_response = self._handle_about_query()
+            return self._handle_about_query
         
         # Agradecimentos
         elif any(palavra in message_lower for palavra in ['obrigado', 'obrigada', 'valeu', 'muito obrigado', 'agradeço', 'grato', 'grata']):
-            ai_response = self._handle_thanks()
+            return self._handle_thanks
         
         # Despedidas
         elif any(palavra in message_lower for palavra in ['tchau', 'até logo', 'até mais', 'adeus', 'bye', 'até breve', 'falou', 'tá bom', 'ok obrigado', 'não precisa mais', 'é isso']):
-            ai_response = self._handle_goodbye()
+            return self._handle_goodbye
         
         # Resposta padrão
-        else:
-            ai_response = self._handle_default_query()
+        return self._handle_default_query
+    
+    def uses_database(self, message: str) -> bool:
+        """Indica se a resposta para a mensagem consultaria o banco de dados"""
+        handler = self._route(message.lower())
+        return getattr(handler, 'func', handler) in (
+            self._handle_database_analysis, self._handle_database_query
+        )
+    
+    def _handle_greeting(self) -> str:
+        """Trata saudações conforme o horário"""
+        hour = datetime.datetime.now().hour
         
-        response_time = time.time() - start_time
+        if hour < 12:
+            saudacao = f"🌅 Bom dia! Sou o {self.ai_name}, sua IA especialista em PostgreSQL!"
+        elif hour < 18:
+            saudacao = f"🌤️ Boa tarde! Sou o {self.ai_name}, como posso ajudar com PostgreSQL hoje?"
+        else:
+            saudacao = f"🌙 Boa noite! Sou o {self.ai_name}, pronto para ajudar com suas consultas!"
         
-        return {
-            "response": ai_response,
-            "tokens_used": 0,
-            "response_time": response_time,
-            "session_id": session_id,
-            "mode": "fallback"
-        }
+        return f"{saudacao}\n\n📋 Posso ajudar com:\n• Consultas SQL\n• Otimização de banco\n• Comandos PostgreSQL\n• Previsão do tempo no Brasil\n\nComo posso ajudar?"
     
     def _handle_weather_query(self, message_lower: str) -> str:
         """Trata consultas sobre clima"""
@@ -120,6 +120,28 @@ class DatabaseManager:
             self.logger.error(f"Erro ao executar comando: {e}")
             raise
     
+    def execute_maintenance(self, command: str):
+        """
+        Executa um comando de manutenção (ANALYZE, VACUUM, REINDEX) fora de transação
+        
+        Usa uma conexão dedicada em autocommit, pois comandos como
+        REINDEX ... CONCURRENTLY não podem rodar dentro de um bloco de transação.
+        
+        Args:
+            command: Comando SQL de manutenção
+        """
+        conn = psycopg2.connect(self.config.database_url)
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(command)
+            self.logger.debug(f"Comando de manutenção executado: {command}")
+        except Exception as e:
+            self.logger.error(f"Erro ao executar comando de manutenção: {e}")
+            raise
+        finally:
+            conn.close()
+    
     def create_tables(self):
         """Cria todas as tabelas definidas nos modelos"""
         try:
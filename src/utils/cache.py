@@ -0,0 +1,114 @@
+"""
+Cache distribuído de respostas em Redis (opcional)
+"""
+import hashlib
+import json
+from typing import Dict, Any, Optional
+
+# Redis é opcional: sem ele o cache fica desativado
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    aioredis = None
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+from .logger import setup_logger
+
+class RedisCache:
+    """Cache de respostas compartilhado entre processos via Redis"""
+
+    def __init__(self, url: Optional[str], ttl: int = 300, prefix: str = "mamute"):
+        """
+        Inicializa o cache
+
+        Args:
+            url: URL do Redis (ex.: redis://localhost:6379/0); None desativa o cache
+            ttl: Tempo de vida das entradas em segundos
+            prefix: Prefixo das chaves
+        """
+        self.ttl = ttl
+        self.prefix = prefix
+        self.version_key = f"{prefix}:version"
+        self.logger = setup_logger(__name__)
+
+        self.client = None
+        if url and REDIS_AVAILABLE:
+            self.client = aioredis.Redis.from_url(url, socket_timeout=0.5)
+        elif url:
+            self.logger.warning("Biblioteca 'redis' não disponível - instale com: pip install redis")
+
+    @property
+    def available(self) -> bool:
+        """Indica se o cache está ativo"""
+        return self.client is not None
+
+    def _disable(self, error: Exception):
+        """Desativar o cache após falha de comunicação com o Redis"""
+        self.logger.warning(f"Redis indisponível, cache distribuído desativado: {error}")
+        self.client = None
+
+    def key(self, normalized_query: str) -> str:
+        """Chave da consulta: mamute:q:{sha1(consulta normalizada)}"""
+        digest = hashlib.sha1(normalized_query.encode('utf-8')).hexdigest()
+        return f"{self.prefix}:q:{digest}"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Obtém uma resposta do cache
+
+        A versão do corpus é lida na mesma ida ao Redis; entradas gravadas
+        antes da última ingestão são ignoradas.
+
+        Returns:
+            Dict: Resposta em cache ou None
+        """
+        if not self.client:
+            return None
+
+        try:
+            version, raw = await self.client.mget(self.version_key, key)
+        except Exception as e:
+            self._disable(e)
+            return None
+
+        if raw is None:
+            return None
+
+        entry = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+        if entry.get('v') != int(version or 0):
+            return None
+        return entry.get('r')
+
+    async def set(self, key: str, response: Dict[str, Any]):
+        """Grava uma resposta no cache com TTL"""
+        if not self.client:
+            return
+
+        try:
+            version = int(await self.client.get(self.version_key) or 0)
+            entry = {'v': version, 'r': response}
+            if ORJSON_AVAILABLE:
+                payload = orjson.dumps(entry, default=str)
+            else:
+                payload = json.dumps(entry, default=str, ensure_ascii=False)
+            await self.client.set(key, payload, ex=self.ttl)
+        except Exception as e:
+            self._disable(e)
+
+    async def bump_version(self):
+        """Invalida todas as respostas em cache (chamar após ingestão de documentos)"""
+        if not self.client:
+            return
+
+        try:
+            await self.client.incr(self.version_key)
+        except Exception as e:
+            self._disable(e)
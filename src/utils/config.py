@@ -44,6 +44,11 @@ class Config:
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
         self.max_tokens = int(os.getenv("MAX_TOKENS", 4000))
         self.temperature = float(os.getenv("TEMPERATURE", 0.7))
+        self.history_maxlen = int(os.getenv("HISTORY_MAXLEN", 200))
+        self.max_concurrent_llm = int(os.getenv("MAX_CONCURRENT_LLM", 16))
+        
+        # Cache distribuído de respostas (opcional)
+        self.redis_url = os.getenv("REDIS_URL")
     
     def validate(self, check_openai: bool = True) -> bool:
         """
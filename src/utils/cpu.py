@@ -0,0 +1,56 @@
+"""
+Amostragem não bloqueante do uso de CPU
+"""
+import threading
+
+# psutil é opcional: sem ele o uso de CPU é reportado como 0
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+    psutil = None
+
+
+def _busy_and_total(times) -> tuple:
+    """Tempo ocupado e tempo total de CPU (mesmos critérios de psutil.cpu_percent)"""
+    total = sum(times)
+    # guest/guest_nice (Linux) já estão contados em user/nice
+    total -= getattr(times, 'guest', 0) + getattr(times, 'guest_nice', 0)
+    busy = total - times.idle - getattr(times, 'iowait', 0)
+    return busy, total
+
+
+class CpuSampler:
+    """Uso de CPU desde a leitura anterior deste amostrador
+
+    psutil.cpu_percent(interval=None) guarda uma única referência global por
+    processo: leitores diferentes redefinem a janela uns dos outros. Cada
+    CpuSampler mantém a própria referência (psutil.cpu_times), então o monitor,
+    o dashboard e os diagnósticos medem janelas independentes.
+    """
+
+    def __init__(self):
+        """Inicializa o amostrador com a leitura atual como referência"""
+        self._lock = threading.Lock()
+        self._last = _busy_and_total(psutil.cpu_times()) if PSUTIL_AVAILABLE else (0.0, 0.0)
+
+    def percent(self) -> float:
+        """
+        Uso de CPU (0-100) desde a leitura anterior, sem bloquear
+
+        Returns:
+            float: Porcentagem de uso; 0.0 sem psutil ou sem tempo decorrido
+        """
+        if not PSUTIL_AVAILABLE:
+            return 0.0
+
+        current = _busy_and_total(psutil.cpu_times())
+        with self._lock:
+            (last_busy, last_total), self._last = self._last, current
+
+        busy_delta = current[0] - last_busy
+        total_delta = current[1] - last_total
+        if total_delta <= 0:
+            return 0.0
+        return round(min(max(busy_delta / total_delta * 100, 0.0), 100.0), 1)
@@ -59,7 +59,7 @@ async def test_language_knowledge():
     
     # Teste 4: Scan de projeto simulado
     print("\n📋 TESTE 4: Análise de projeto com Pascal")
-    project_info = ia.scan_project_languages(".")
+    project_info = await ia.scan_project_languages_async(".")
     print(f"Linguagens detectadas: {list(project_info.get('languages_detected', {}).keys())}")
     
     # Teste 5: Perguntas sobre Pascal
@@ -4,7 +4,7 @@ Interface web para navegadores
 """
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, File, UploadFile, Form
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List, Dict, Any
@@ -14,6 +14,14 @@ import os
 import sys
 from datetime import datetime
 
+# orjson serializa as respostas da API bem mais rápido; sem ele, JSONResponse padrão
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
 # Adicionar o diretório principal ao path
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
@@ -84,7 +92,8 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
 )
 
 # Montar arquivos estáticos
@@ -521,6 +530,11 @@ async def add_document(doc_data: DocumentAdd):
             category=doc_data.category
         )
         
+        # Respostas em cache e contagem de documentos ficaram desatualizadas
+        if hasattr(ia_system, 'chat_personality') and ia_system.chat_personality:
+            await ia_system.chat_personality.invalidate_response_cache()
+            ia_system.chat_personality.invalidate_doc_count()
+        
         return {
             "document_id": doc_id,
             "message": "Documento adicionado com sucesso"